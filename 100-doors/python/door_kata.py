@@ -1,9 +1,217 @@
+import io
+from array import array
+from functools import lru_cache
+from itertools import islice
+from math import isqrt
+
+_TOGGLE = bytes.maketrans(b'\x00\x01', b'\x01\x00')
+_BIT_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+_PACK_CHUNK = 1 << 16  # doors packed per step, must be a multiple of 8
+_RENDER_CHUNK = 1 << 20  # doors rendered per write, must be a multiple of 8
+_GLYPHS = bytes.maketrans(b'\x00\x01', b'#@')
+_INDEX_BLOCK = 1 << 15  # doors per prefix-sum entry in the partial-pass index
+# Eight glyphs for every possible packed byte, lowest bit (first door) first.
+_BYTE_GLYPHS = [bytes(byte >> bit & 1 for bit in range(8)).translate(_GLYPHS) for byte in range(256)]
+
+
+class PackedDoors:
+    """Door states stored one bit per door; bit i (little-endian) is door i + 1."""
+
+    def __init__(self, count):
+        if count < 0:
+            raise ValueError("Door count cannot be negative")
+        self._count = count
+        self._bits = bytearray((count + 7) >> 3)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        index = self._check_index(index)
+        return bool(self._bits[index >> 3] >> (index & 7) & 1)
+
+    def __setitem__(self, index, is_open):
+        index = self._check_index(index)
+        if is_open:
+            self._bits[index >> 3] |= 1 << (index & 7)
+        else:
+            self._bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    def __iter__(self):
+        bits = self._bits
+        for index in range(self._count):
+            yield bool(bits[index >> 3] >> (index & 7) & 1)
+
+    @property
+    def buffer(self):
+        """Read-only view of the packed bytes."""
+        return memoryview(self._bits).toreadonly()
+
+    def count_open(self, start=0, stop=None):
+        """Count open doors with indices in [start, stop)."""
+        stop = self._count if stop is None else min(stop, self._count)
+        if start >= stop:
+            return 0
+        value = int.from_bytes(self._bits[start >> 3:(stop + 7) >> 3], 'little') >> (start & 7)
+        return (value & ((1 << (stop - start)) - 1)).bit_count()
+
+    def to_list(self):
+        return list(self)
+
+    def _check_index(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Door index out of range")
+        return index
+
+    def _toggle(self, index):
+        self._bits[index >> 3] ^= 1 << (index & 7)
+
+    def _toggle_bytes(self, start, packed):
+        end = start + len(packed)
+        current = int.from_bytes(self._bits[start:end], 'little')
+        self._bits[start:end] = (current ^ int.from_bytes(packed, 'little')).to_bytes(len(packed), 'little')
+
+
+class _OpenDoorIndex:
+    """Door states after a partial run plus prefix sums of open doors per block."""
+
+    def __init__(self, door_count, passes):
+        self.doors = PackedDoors(door_count)
+        DoorKata().run_passes(self.doors, passes)
+        self.prefix = array('Q', [0])
+        for start in range(0, door_count, _INDEX_BLOCK):
+            self.prefix.append(self.prefix[-1] + self.doors.count_open(start, start + _INDEX_BLOCK))
+
+    def count_open(self, start, stop):
+        first_block = -(-start // _INDEX_BLOCK)
+        last_block = stop // _INDEX_BLOCK
+        if first_block >= last_block:
+            return self.doors.count_open(start, stop)
+        return (self.doors.count_open(start, first_block * _INDEX_BLOCK)
+                + self.prefix[last_block] - self.prefix[first_block]
+                + self.doors.count_open(last_block * _INDEX_BLOCK, stop))
+
+
+@lru_cache(maxsize=16)
+def _open_door_index(door_count, passes):
+    return _OpenDoorIndex(door_count, passes)
+
+
 class DoorKata:
     def run_door_kata(self, doors):
+        if isinstance(doors, PackedDoors):
+            self.run_passes(doors, len(doors))
+            return
         for pass_num in range(1, len(doors) + 1):
             for door in range(pass_num - 1, len(doors), pass_num):
                 doors[door] = not doors[door]
 
+    def run_passes(self, doors, passes):
+        """Apply the first `passes` passes to `doors` (a list of bools or PackedDoors)."""
+        passes = min(max(passes, 0), len(doors))
+        if not isinstance(doors, PackedDoors):
+            for pass_num in range(1, passes + 1):
+                for door in range(pass_num - 1, len(doors), pass_num):
+                    doors[door] = not doors[door]
+            return
+
+        # Doors up to the last pass have seen every one of their divisors, so
+        # only perfect squares flip.  Later doors need their divisors <= passes
+        # counted, which is sieved below from the first byte boundary on.
+        count = len(doors)
+        sieve_start = count if passes == count else passes & ~7
+        for root in range(1, isqrt(sieve_start) + 1):
+            doors._toggle(root * root - 1)
+        if sieve_start < count:
+            self._sieve_partial(doors, sieve_start, passes)
+
+    def is_door_open(self, door_number, passes=None):
+        """Whether 1-based `door_number` is open after `passes` passes (default: all of them)."""
+        if door_number < 1:
+            raise ValueError("Door numbers start at 1")
+        if passes is None or passes >= door_number:
+            return isqrt(door_number) ** 2 == door_number
+        # Divisor pairs (d, door_number // d) with d below the square root.
+        toggles = 0
+        for divisor in range(1, min(isqrt(door_number), passes) + 1):
+            if door_number % divisor == 0:
+                toggles += 1
+                paired = door_number // divisor
+                if paired != divisor and paired <= passes:
+                    toggles += 1
+        return toggles % 2 == 1
+
+    def count_open_doors(self, first, last, passes=None, door_count=None):
+        """Count open doors numbered first..last (inclusive, 1-based) after `passes` passes.
+
+        Full runs are answered from the perfect-square rule.  Partial runs
+        build a sieved index for `door_count` doors (default `last`) that is
+        cached per (door_count, passes), so repeated queries are lookups.
+        """
+        door_count = last if door_count is None else door_count
+        if not 1 <= first <= last <= door_count:
+            raise ValueError("Door range must satisfy 1 <= first <= last <= door_count")
+        if passes is None or passes >= last:
+            return isqrt(last) - isqrt(first - 1)
+        return _open_door_index(door_count, min(max(passes, 0), door_count)).count_open(first - 1, last)
+
     def get_door_state_string(self, doors):
         return ''.join('@' if door else '#' for door in doors)
 
+    def write_door_state(self, doors, out, chunk_size=_RENDER_CHUNK):
+        """Stream the '@'/'#' state of `doors` to a file-like object in fixed-size chunks.
+
+        `out` may be a text or binary stream, or anything with a `write(bytes)`
+        method such as an `mmap` sized to `len(doors)`.  Returns the number of
+        doors written.
+        """
+        if chunk_size <= 0 or chunk_size & 7:
+            raise ValueError("Chunk size must be a positive multiple of 8")
+        is_text = isinstance(out, io.TextIOBase)
+        written = 0
+        for chunk in self._render_chunks(doors, chunk_size):
+            out.write(chunk.decode('ascii') if is_text else chunk)
+            written += len(chunk)
+        return written
+
+    def _render_chunks(self, doors, chunk_size):
+        if isinstance(doors, PackedDoors):
+            packed = doors.buffer
+            count = len(doors)
+            step = chunk_size >> 3
+            for start in range(0, len(packed), step):
+                chunk = b''.join(map(_BYTE_GLYPHS.__getitem__, packed[start:start + step]))
+                yield chunk[:count - (start << 3)]
+            return
+        states = iter(doors)
+        while True:
+            chunk = bytes(map(bool, islice(states, chunk_size)))
+            if not chunk:
+                return
+            yield chunk.translate(_GLYPHS)
+
+    def _sieve_partial(self, doors, start, passes):
+        # Sieved one window at a time, one byte per door, then packed into
+        # bits, so only a window's worth of flips is ever held in memory.
+        count = len(doors)
+        for offset in range(start, count, _PACK_CHUNK):
+            low, high = offset + 1, min(offset + _PACK_CHUNK, count) + 1  # door numbers in the window
+            flips = bytearray(high - low)
+            # Passes up to about sqrt(high) are sliced one pass at a time.
+            small = min(passes, isqrt(high))
+            for pass_num in range(1, small + 1):
+                first = -(-low // pass_num) * pass_num - low
+                flips[first::pass_num] = flips[first::pass_num].translate(_TOGGLE)
+            # Larger passes hit door q * pass_num for few quotients q, and for
+            # a fixed q those doors are q apart, so each q is one slice.
+            if passes > small:
+                for quotient in range(-(-low // passes), (high - 1) // (small + 1) + 1):
+                    first_pass = max(small + 1, -(-low // quotient))
+                    last_pass = min(passes, (high - 1) // quotient)
+                    if first_pass <= last_pass:
+                        hits = slice(quotient * first_pass - low, quotient * last_pass - low + 1, quotient)
+                        flips[hits] = flips[hits].translate(_TOGGLE)
+            packed = int(flips.translate(_BIT_DIGITS)[::-1], 2).to_bytes((len(flips) + 7) >> 3, 'little')
+            doors._toggle_bytes(offset >> 3, packed)
@@ -1,5 +1,6 @@
+import io
 import pytest
-from door_kata import DoorKata 
+from door_kata import DoorKata, PackedDoors
 
 # To ensure the best coverage with as few tests as possible, you will want to follow boundaries and equivalence partitions.
 # Consider these partitions:
@@ -37,3 +38,69 @@ def test_non_perfect_square_inside_partition_doors_5_and_7():
     assert not doors[4], "Door 5 should be closed"  # Door 5 (Closed)
     assert not doors[6], "Door 7 should be closed"  # Door 7 (Closed)
 
+
+def test_packed_doors_match_list_of_bools():
+    dk = DoorKata()
+    doors = [False] * 100
+    packed = PackedDoors(100)
+    dk.run_door_kata(doors)
+    dk.run_door_kata(packed)
+    assert packed.to_list() == doors
+    assert packed.count_open() == 10
+
+@pytest.mark.parametrize("count,passes", [(1, 1), (9, 3), (100, 7), (100, 50), (1000, 999), (200000, 40),
+                                          (140000, 0), (140000, 700), (200000, 150000)])
+def test_partial_passes_match_list_of_bools(count, passes):
+    dk = DoorKata()
+    doors = [False] * count
+    packed = PackedDoors(count)
+    dk.run_passes(doors, passes)
+    dk.run_passes(packed, passes)
+    assert packed.to_list() == doors
+
+def test_packed_doors_use_one_bit_per_door():
+    packed = PackedDoors(100)
+    assert len(packed.buffer) == 13
+
+def test_write_door_state_streams_same_string_for_lists_and_packed_doors():
+    dk = DoorKata()
+    doors = [False] * 100
+    packed = PackedDoors(100)
+    dk.run_door_kata(doors)
+    dk.run_door_kata(packed)
+    text_out, binary_out = io.StringIO(), io.BytesIO()
+
+    assert dk.write_door_state(doors, text_out, chunk_size=16) == 100
+    assert dk.write_door_state(packed, binary_out, chunk_size=16) == 100
+    assert text_out.getvalue() == dk.get_door_state_string(doors)
+    assert binary_out.getvalue().decode('ascii') == dk.get_door_state_string(doors)
+
+def test_write_door_state_rejects_unaligned_chunk_size():
+    with pytest.raises(ValueError):
+        DoorKata().write_door_state([], io.BytesIO(), chunk_size=10)
+
+@pytest.mark.parametrize("passes", [None, 1, 2, 6, 13, 100])
+def test_point_queries_match_simulation(passes):
+    dk = DoorKata()
+    doors = [False] * 100
+    dk.run_passes(doors, 100 if passes is None else passes)
+    assert [dk.is_door_open(number, passes) for number in range(1, 101)] == doors
+
+@pytest.mark.parametrize("first,last,passes", [(1, 100, None), (5, 50, None), (1, 100, 7), (13, 97, 20), (40, 40, 3)])
+def test_range_queries_match_simulation(first, last, passes):
+    dk = DoorKata()
+    doors = [False] * 100
+    dk.run_passes(doors, 100 if passes is None else passes)
+    assert dk.count_open_doors(first, last, passes, door_count=100) == sum(doors[first - 1:last])
+
+def test_range_query_spanning_index_blocks():
+    dk = DoorKata()
+    doors = PackedDoors(100000)
+    dk.run_passes(doors, 30)
+    assert dk.count_open_doors(1000, 99000, 30, door_count=100000) == doors.count_open(999, 99000)
+
+def test_invalid_door_queries():
+    with pytest.raises(ValueError):
+        DoorKata().is_door_open(0)
+    with pytest.raises(ValueError):
+        DoorKata().count_open_doors(10, 5)
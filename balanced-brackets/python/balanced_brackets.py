@@ -1,12 +1,269 @@
+import mmap
+import re
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+
+_SCAN_WINDOW = 1 << 20  # characters or bytes translated per step
+_PARALLEL_CHUNK = 1 << 24  # bytes of a file summarised by one worker task
+BracketStreamState = namedtuple('BracketStreamState', 'offset mismatch depth stack')
+
+
 class BalancedBrackets:
+    ALL_PAIRS = '()[]{}<>'
+
+    def __init__(self, pairs='[]'):
+        """`pairs` is a string of opener/closer pairs such as '()[]' or a sequence of 2-char strings."""
+        if isinstance(pairs, str):
+            if len(pairs) % 2:
+                raise ValueError("Bracket pairs must be given as opener/closer pairs")
+            pairs = [pairs[i:i + 2] for i in range(0, len(pairs), 2)]
+        if not pairs or any(len(pair) != 2 for pair in pairs):
+            raise ValueError("Bracket pairs must be given as opener/closer pairs")
+        openers = ''.join(pair[0] for pair in pairs)
+        closers = ''.join(pair[1] for pair in pairs)
+        if len(set(openers + closers)) != 2 * len(pairs):
+            raise ValueError("Bracket characters must be distinct")
+        if len(pairs) > 255:
+            raise ValueError("At most 255 bracket pairs are supported")
+
+        self._pairs = tuple(opener + closer for opener, closer in zip(openers, closers))
+
+        # Openers map to 1..n and closers to -1..-n so the stack holds one byte per level.
+        self._codes = {opener: code for code, opener in enumerate(openers, 1)}
+        self._codes.update({closer: -code for code, closer in enumerate(closers, 1)})
+        self._pattern = re.compile('[' + re.escape(openers + closers) + ']')
+        self._single_pair = len(pairs) == 1
+        # With ASCII brackets, input is scanned as bytes: everything else is
+        # deleted in bulk by bytes.translate and only bracket bytes are looped over.
+        if (openers + closers).isascii():
+            self._byte_pattern = re.compile(self._pattern.pattern.encode('ascii'))
+            self._byte_codes = [0] * 256
+            for key, code in self._codes.items():
+                self._byte_codes[ord(key)] = code
+            self._non_brackets = bytes(byte for byte in range(256) if not self._byte_codes[byte])
+        else:
+            self._byte_pattern = self._byte_codes = self._non_brackets = None
+
     def is_balanced(self, input):
-        stack = []
+        return self.find_mismatch(input) == -1
+
+    def find_mismatch(self, input):
+        """Return the offset of the first mismatched bracket, or -1 when balanced.
+
+        A closer with nothing (or the wrong opener) to close reports its own
+        offset; openers left unclosed at the end report len(input).
+        """
+        stack = bytearray()
+        mismatch, depth = self._scan(input, stack, 0)
+        if mismatch != -1:
+            return mismatch
+        return -1 if depth == 0 else len(input)
+
+    def find_mismatch_parallel(self, path, workers=None, chunk_size=_PARALLEL_CHUNK):
+        """Like find_mismatch over the bytes of the file at `path`, split across processes.
+
+        Each worker memory-maps the file itself and summarises its chunk as
+        (unmatched closers, unmatched openers); the summaries are merged in
+        order here.  The chunk holding the first error is rescanned from the
+        merged state so the offset matches the sequential scan exactly.
+        """
+        if self._byte_codes is None:
+            raise ValueError("Byte input needs ASCII bracket pairs")
+        with open(path, 'rb') as file:
+            size = file.seek(0, 2)
+            if size == 0:
+                return -1
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if size <= chunk_size:
+                    return self.find_mismatch(mapped)
+                return self._merge_chunks(path, mapped, size, workers, chunk_size)
+
+    def _merge_chunks(self, path, mapped, size, workers, chunk_size):
+        starts = range(0, size, chunk_size)
+        stack, depth = bytearray(), 0
+        executor = ProcessPoolExecutor(workers)
+        try:
+            summaries = executor.map(_summarise_chunk, [self._pairs] * len(starts), [path] * len(starts),
+                                     starts, [min(start + chunk_size, size) for start in starts])
+            for start, (closers, openers, failed) in zip(starts, summaries):
+                if self._single_pair:
+                    matched = not failed and closers <= depth
+                    if matched:
+                        depth += openers - closers
+                else:
+                    kept = len(stack) - len(closers)
+                    matched = not failed and kept >= 0 and stack[kept:] == closers[::-1]
+                    if matched:
+                        del stack[kept:]
+                        stack += openers
+                if not matched:
+                    with memoryview(mapped) as view:
+                        mismatch, _ = self._scan(view[start:start + chunk_size], stack, depth)
+                    return start + mismatch
+        finally:
+            executor.shutdown(cancel_futures=True)
+        return -1 if depth == 0 and not stack else size
+
+    def _summarise(self, buffer, start, stop):
+        """Reduce buffer[start:stop] to (unmatched closers, unmatched openers, failed).
+
+        Single-pair summaries are counts; otherwise they are bytes of pair
+        codes, closers in input order and openers as a stack.  `failed` marks a
+        closer that mismatches an opener from the same chunk, which is an
+        error whatever came before.
+        """
+        codes = self._byte_codes
+        closers, stack = bytearray(), bytearray()
+        closer_count = depth = 0
+        with memoryview(buffer) as view:
+            for window_start in range(start, stop, _SCAN_WINDOW):
+                brackets = bytes(view[window_start:min(window_start + _SCAN_WINDOW, stop)])
+                brackets = brackets.translate(None, self._non_brackets)
+                if self._single_pair:
+                    for byte in brackets:
+                        if codes[byte] > 0:
+                            depth += 1
+                        elif depth:
+                            depth -= 1
+                        else:
+                            closer_count += 1
+                    continue
+                for byte in brackets:
+                    code = codes[byte]
+                    if code > 0:
+                        stack.append(code)
+                    elif not stack:
+                        closers.append(-code)
+                    elif stack[-1] == -code:
+                        stack.pop()
+                    else:
+                        return closers, stack, True
+        if self._single_pair:
+            return closer_count, depth, False
+        return closers, stack, False
+
+    def _scan(self, text, stack, depth):
+        """Scan str or bytes-like `text`, continuing from `stack`/`depth`.
+
+        Returns (offset of the first mismatch in `text` or -1, new depth).
+        Multi-pair scans push onto `stack` in place and report its length as
+        the depth; single-pair scans only track the counter.
+        """
+        if self._byte_codes is None:
+            if not isinstance(text, str):
+                raise ValueError("Byte input needs ASCII bracket pairs")
+            return self._scan_matches(text, stack, depth)
+
+        is_text = isinstance(text, str)
+        if not is_text:
+            text = memoryview(text)
+        for start in range(0, len(text), _SCAN_WINDOW):
+            window = text[start:start + _SCAN_WINDOW]
+            data = window.encode('utf-8', 'surrogatepass') if is_text else bytes(window)
+            mismatch, depth = self._scan_brackets(data.translate(None, self._non_brackets), stack, depth)
+            if mismatch != -1:
+                # Map the index among bracket bytes back to an offset in the window.
+                if is_text:
+                    matches = self._pattern.finditer(window)
+                else:
+                    matches = self._byte_pattern.finditer(data)
+                return start + next(islice(matches, mismatch, None)).start(), depth
+        return -1, depth
+
+    def _scan_brackets(self, brackets, stack, depth):
+        codes = self._byte_codes
+        if self._single_pair:
+            for index, byte in enumerate(brackets):
+                if codes[byte] > 0:
+                    depth += 1
+                elif depth:
+                    depth -= 1
+                else:
+                    return index, depth
+            return -1, depth
+
+        for index, byte in enumerate(brackets):
+            code = codes[byte]
+            if code > 0:
+                stack.append(code)
+            elif stack and stack[-1] == -code:
+                stack.pop()
+            else:
+                return index, len(stack)
+        return -1, len(stack)
+
+    def _scan_matches(self, text, stack, depth):
+        codes = self._codes
+        if self._single_pair:
+            for match in self._pattern.finditer(text):
+                if codes[match.group()] > 0:
+                    depth += 1
+                elif depth:
+                    depth -= 1
+                else:
+                    return match.start(), depth
+            return -1, depth
+
+        for match in self._pattern.finditer(text):
+            code = codes[match.group()]
+            if code > 0:
+                stack.append(code)
+            elif stack and stack[-1] == -code:
+                stack.pop()
+            else:
+                return match.start(), len(stack)
+        return -1, len(stack)
+
+
+@lru_cache(maxsize=None)
+def _brackets_for(pairs):
+    return BalancedBrackets(pairs)
+
+
+def _summarise_chunk(pairs, path, start, stop):
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return _brackets_for(pairs)._summarise(mapped, start, stop)
+
+
+class BracketStreamValidator:
+    """Validate brackets across chunks fed one at a time, keeping only the open stack.
+
+    Offsets count characters for str chunks and bytes for bytes-like chunks.
+    """
+
+    def __init__(self, pairs='[]'):
+        self._brackets = pairs if isinstance(pairs, BalancedBrackets) else BalancedBrackets(pairs)
+        self.restore(BracketStreamState(0, -1, 0, b''))
+
+    def feed(self, chunk):
+        """Scan the next str, bytes, bytearray, memoryview or mmap chunk."""
+        if self._mismatch == -1:
+            mismatch, self._depth = self._brackets._scan(chunk, self._stack, self._depth)
+            if mismatch != -1:
+                self._mismatch = self._offset + mismatch
+        self._offset += len(chunk)
+
+    def feed_file(self, path):
+        """Memory-map the file at `path` and scan it as one bytes chunk."""
+        with open(path, 'rb') as file:
+            if file.seek(0, 2) == 0:
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                self.feed(mapped)
+
+    def finish(self):
+        """Return the offset of the first mismatch, the total length when brackets are left open, or -1."""
+        if self._mismatch != -1:
+            return self._mismatch
+        return -1 if self._depth == 0 else self._offset
 
-        for c in input:
-            if c == '[':
-                stack.append(c)
-            elif c == ']':
-                if not stack or stack.pop() != '[':
-                    return False
+    def snapshot(self):
+        return BracketStreamState(self._offset, self._mismatch, self._depth, bytes(self._stack))
 
-        return len(stack) == 0
+    def restore(self, state):
+        self._offset = state.offset
+        self._mismatch = state.mismatch
+        self._depth = state.depth
+        self._stack = bytearray(state.stack)
@@ -0,0 +1,68 @@
+"""Throughput of the bracket validators in MB/s.
+
+Run with `python bench_balanced_brackets.py`.
+"""
+import os
+import tempfile
+import time
+
+from balanced_brackets import BalancedBrackets, BracketStreamValidator
+
+PAYLOAD_REPEATS = 200_000
+CHUNK_SIZE = 1 << 16
+PARALLEL_COPIES = 8
+
+
+def per_char_stack(input):
+    # The original list-of-characters implementation, kept as the baseline.
+    stack = []
+    for c in input:
+        if c == '[':
+            stack.append(c)
+        elif c == ']':
+            if not stack or stack.pop() != '[':
+                return False
+    return len(stack) == 0
+
+
+def stream_chunks(data):
+    validator = BracketStreamValidator()
+    for start in range(0, len(data), CHUNK_SIZE):
+        validator.feed(data[start:start + CHUNK_SIZE])
+    return validator.finish() == -1
+
+
+def report(name, func, data):
+    started = time.perf_counter()
+    result = func(data)
+    elapsed = time.perf_counter() - started
+    print(f"{name:<28} {len(data) / elapsed / 1e6:8.1f} MB/s  balanced={result}")
+
+
+def parallel_scaling(data):
+    with tempfile.NamedTemporaryFile(delete=False) as file:
+        for _ in range(PARALLEL_COPIES):
+            file.write(data)
+    try:
+        size = len(data) * PARALLEL_COPIES
+        validator = BalancedBrackets()
+        for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+            started = time.perf_counter()
+            result = validator.find_mismatch_parallel(file.name, workers=workers)
+            elapsed = time.perf_counter() - started
+            print(f"parallel file, {workers:>2} workers  {size / elapsed / 1e6:8.1f} MB/s  mismatch={result}")
+    finally:
+        os.unlink(file.name)
+
+
+def main():
+    text = '{"items": [[1, 2], [3, [4, 5]]], "name": "value"}' * PAYLOAD_REPEATS
+    data = memoryview(text.encode('ascii'))
+    report("per-char stack (str)", per_char_stack, text)
+    report("is_balanced (str)", BalancedBrackets().is_balanced, text)
+    report("stream feed (bytes chunks)", stream_chunks, data)
+    parallel_scaling(data)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,5 @@
 import pytest
-from balanced_brackets import BalancedBrackets
+from balanced_brackets import BalancedBrackets, BracketStreamValidator
 
 class TestBalancedBrackets:
     """
@@ -108,3 +108,208 @@ class TestBalancedBrackets:
         # Assert
         assert not result
 
+
+    def test_brackets_ignore_other_characters(self):
+        # Arrange
+        input = "key: [a, [b, c]]"
+
+        # Act
+        result = BalancedBrackets().is_balanced(input)
+
+        # Assert
+        assert result
+
+    def test_mismatch_offset_for_unmatched_closing_bracket(self):
+        # Arrange
+        input = "[a]]b"
+
+        # Act
+        result = BalancedBrackets().find_mismatch(input)
+
+        # Assert
+        assert result == 3
+
+    def test_mismatch_offset_for_unclosed_bracket_is_end_of_input(self):
+        # Arrange
+        input = "[[]"
+
+        # Act
+        result = BalancedBrackets().find_mismatch(input)
+
+        # Assert
+        assert result == 3
+
+    def test_mismatch_offset_is_minus_one_when_balanced(self):
+        # Arrange
+        input = "[[]]"
+
+        # Act
+        result = BalancedBrackets().find_mismatch(input)
+
+        # Assert
+        assert result == -1
+
+    def test_mismatch_offset_counts_characters_not_bytes(self):
+        # Arrange
+        input = "[é]ü]"
+
+        # Act
+        result = BalancedBrackets().find_mismatch(input)
+
+        # Assert
+        assert result == 4
+
+    def test_mismatch_offset_beyond_first_scan_window(self):
+        # Arrange
+        input = "[" + "x" * 3_000_000 + "]]"
+
+        # Act
+        result = BalancedBrackets().find_mismatch(input)
+
+        # Assert
+        assert result == 3_000_002
+
+    @pytest.mark.parametrize("input,expected", [
+        ("({[<>]})", -1),
+        ("if (a[0] < b) { c(); }", 12),
+        ("{(})", 2),
+        ("(]", 1),
+        ("{[", 2),
+    ])
+    def test_multiple_bracket_types(self, input, expected):
+        # Act
+        result = BalancedBrackets(BalancedBrackets.ALL_PAIRS).find_mismatch(input)
+
+        # Assert
+        assert result == expected
+
+    def test_custom_bracket_pairs(self):
+        # Arrange
+        validator = BalancedBrackets(["«»", "⟨⟩"])
+
+        # Act / Assert
+        assert validator.is_balanced("«a ⟨b⟩ c» [")
+        assert validator.find_mismatch("«⟨»⟩") == 2
+
+    @pytest.mark.parametrize("pairs", ["", "(", "((", ["()", "(]"]])
+    def test_invalid_bracket_pairs(self, pairs):
+        with pytest.raises(ValueError):
+            BalancedBrackets(pairs)
+
+
+class TestBracketStreamValidator:
+    """
+    Partitions and Boundaries to be tested:
+
+    Brackets split across chunks
+    Mismatch offset counted across chunks
+    Unclosed brackets at end of stream
+    Bytes, memoryview and memory-mapped file input
+    Snapshot and restore mid-stream
+    """
+
+    @pytest.mark.parametrize("chunks,expected", [
+        (["[[", "]", "]"], -1),
+        (["[a", "b]", "]"], 4),
+        (["[", "[]"], 3),
+        ([b"[[", memoryview(b"]]")], -1),
+    ])
+    def test_chunks_give_same_offset_as_whole_input(self, chunks, expected):
+        # Arrange
+        validator = BracketStreamValidator()
+
+        # Act
+        for chunk in chunks:
+            validator.feed(chunk)
+
+        # Assert
+        assert validator.finish() == expected
+
+    def test_multiple_bracket_types_across_chunks(self):
+        # Arrange
+        validator = BracketStreamValidator(BalancedBrackets.ALL_PAIRS)
+
+        # Act
+        validator.feed(b"{(")
+        validator.feed(b"[])")
+        validator.feed(b">}")
+
+        # Assert
+        assert validator.finish() == 5
+
+    def test_feed_file_validates_memory_mapped_file(self, tmp_path):
+        # Arrange
+        path = tmp_path / "payload.txt"
+        path.write_bytes(b"[x[y]z]" * 1000 + b"]")
+        validator = BracketStreamValidator()
+
+        # Act
+        validator.feed_file(path)
+
+        # Assert
+        assert validator.finish() == 7000
+
+    def test_snapshot_and_restore_resumes_validation(self):
+        # Arrange
+        validator = BracketStreamValidator("()[]")
+        validator.feed("([")
+        state = validator.snapshot()
+        validator.feed(")")
+        assert validator.finish() == 2
+
+        # Act
+        resumed = BracketStreamValidator("()[]")
+        resumed.restore(state)
+        resumed.feed("])")
+
+        # Assert
+        assert resumed.finish() == -1
+
+    def test_byte_input_with_non_ascii_pairs_is_rejected(self):
+        with pytest.raises(ValueError):
+            BracketStreamValidator("«»").feed(b"x")
+
+
+class TestParallelBalancedBrackets:
+    """
+    Partitions and Boundaries to be tested:
+
+    Balanced file split into many chunks
+    Unmatched closer resolved only when merging chunks
+    Mismatch inside a single chunk
+    Unclosed brackets at end of file
+    Empty file and file smaller than one chunk
+    """
+
+    @pytest.mark.parametrize("pairs,payload", [
+        ("[]", b"[a[b]c]" * 50),
+        ("[]", b"[" * 40 + b"]" * 41 + b"[]"),
+        ("[]", b"[[x]" * 30),
+        (BalancedBrackets.ALL_PAIRS, b"{<(x)>[y]}" * 20),
+        (BalancedBrackets.ALL_PAIRS, b"{[(" * 10 + b")]}" * 9 + b"]})"),
+        (BalancedBrackets.ALL_PAIRS, b"({[]})" * 10 + b"(<]>)"),
+        (BalancedBrackets.ALL_PAIRS, b"(" * 20 + b"}"),
+        ("[]", b""),
+    ])
+    def test_parallel_matches_sequential(self, tmp_path, pairs, payload):
+        # Arrange
+        path = tmp_path / "payload.txt"
+        path.write_bytes(payload)
+        validator = BalancedBrackets(pairs)
+
+        # Act
+        result = validator.find_mismatch_parallel(path, workers=2, chunk_size=7)
+
+        # Assert
+        assert result == validator.find_mismatch(payload)
+
+    def test_small_file_is_scanned_without_worker_pool(self, tmp_path):
+        # Arrange
+        path = tmp_path / "payload.txt"
+        path.write_bytes(b"[]]")
+
+        # Act
+        result = BalancedBrackets().find_mismatch_parallel(path)
+
+        # Assert
+        assert result == 2
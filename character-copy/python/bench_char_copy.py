@@ -0,0 +1,64 @@
+"""Throughput of AsyncCopier reading lines from a local asyncio stream server.
+
+Each connection is sent one line followed by trailing data the copier must
+not copy.  Run with `python bench_char_copy.py`.
+"""
+import asyncio
+import time
+
+from char_copy import AsyncCopier, AsyncDestinationAdapter, BytesDestination, StreamSource, copy_all
+
+CONNECTIONS = 2000
+LINE_SIZE = 16 * 1024
+PAYLOAD = b'x' * LINE_SIZE + b'\n' + b'trailer'
+
+
+async def serve(reader, writer):
+    writer.write(PAYLOAD)
+    await writer.drain()
+    writer.close()
+
+
+async def copy_line(port, block_size, destinations):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    destination = BytesDestination(LINE_SIZE)
+    await AsyncCopier(StreamSource(reader), AsyncDestinationAdapter(destination), block_size).copy()
+    destinations.append(destination)
+    writer.close()
+
+
+async def report(name, port, block_size, concurrency):
+    destinations = []
+    started = time.perf_counter()
+    if concurrency == 1:
+        for _ in range(CONNECTIONS):
+            await copy_line(port, block_size, destinations)
+    else:
+        await copy_all([_Connection(port, block_size, destinations) for _ in range(CONNECTIONS)], concurrency)
+    elapsed = time.perf_counter() - started
+    assert all(len(destination) == LINE_SIZE for destination in destinations)
+    print(f"{name:<36} {CONNECTIONS / elapsed:8.0f} copies/s {CONNECTIONS * LINE_SIZE / elapsed / 1e6:8.1f} MB/s")
+
+
+class _Connection:
+    """Adapts copy_line to the copier interface copy_all expects."""
+
+    def __init__(self, port, block_size, destinations):
+        self._args = port, block_size, destinations
+
+    async def copy(self):
+        await copy_line(*self._args)
+
+
+async def main():
+    server = await asyncio.start_server(serve, '127.0.0.1', 0, backlog=CONNECTIONS)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        await report("sequential, 64-byte blocks", port, 64, 1)
+        await report("sequential, 4 KiB blocks", port, 4096, 1)
+        await report("1000 concurrent, 64-byte blocks", port, 64, 1000)
+        await report("1000 concurrent, 4 KiB blocks", port, 4096, 1000)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
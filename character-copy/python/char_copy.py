@@ -1,49 +1,441 @@
+import asyncio
+import codecs
+import io
+import re
+import time
 from abc import ABC, abstractmethod
 
+_BLOCK_SIZE = 4096  # characters or bytes requested per block read
+_INITIAL_CAPACITY = 4096  # bytes preallocated by BytesDestination
+_NEWLINE = re.compile(b'\n')
+# Text is encoded as this when it meets bytes, unless a source or destination is given another encoding.
+_BYTE_ENCODING = 'utf-8'
+_NEWLINES = ('\n', b'\n')
+
+
 class ISource(ABC):
     @abstractmethod
     def read_char(self):
         """Method to read a character from the source."""
         pass
 
+    def read_chars(self, count):
+        """Read up to `count` characters, stopping after a newline.
+
+        Sources that can read in blocks override this; Copier only uses it
+        when they do.  The default reads one character at a time.
+        """
+        chars = []
+        while len(chars) < count:
+            char = self.read_char()
+            chars.append(char)
+            if char == '\n':
+                break
+        return ''.join(chars)
+
+    def read_bytes(self, count):
+        """Read up to `count` bytes, stopping after a newline, as a bytes-like object.
+
+        Byte-backed sources override this; Copier only uses it when the
+        destination also overrides write_bytes.
+        """
+        return self.read_chars(count).encode(_BYTE_ENCODING)
+
+
 class IDestination(ABC):
     @abstractmethod
     def write_char(self, char):
         """Method to write a character to the destination."""
         pass
 
+    def write_chars(self, chars):
+        """Write every character in `chars`; override to write them as one block."""
+        for char in chars:
+            self.write_char(char)
+
+    def write_bytes(self, data):
+        """Write a bytes-like block of UTF-8; override to store it without decoding.
+
+        A character split across blocks is held back until its last byte arrives.
+        """
+        decoder = getattr(self, '_byte_decoder', None)
+        if decoder is None:
+            decoder = self._byte_decoder = codecs.getincrementaldecoder(_BYTE_ENCODING)()
+        chars = decoder.decode(data)
+        if chars:
+            self.write_chars(chars)
+
+
+def _overrides(obj, interface, method_name):
+    return getattr(type(obj), method_name, None) not in (None, getattr(interface, method_name))
+
+
+class CopyStats:
+    """Counters filled in by an instrumented Copier; one object can be shared to total several copiers."""
+
+    def __init__(self):
+        self.chars = 0
+        self.reads = 0
+        self.writes = 0
+        self.source_seconds = 0.0
+        self.destination_seconds = 0.0
+
+    @property
+    def chars_per_second(self):
+        seconds = self.source_seconds + self.destination_seconds
+        return self.chars / seconds if seconds else float('inf')
+
+    def __repr__(self):
+        return (f"CopyStats(chars={self.chars}, reads={self.reads}, writes={self.writes}, "
+                f"source_seconds={self.source_seconds:.6f}, destination_seconds={self.destination_seconds:.6f})")
+
+
 class Copier:
-    def __init__(self, source, destination):
+    def __init__(self, source, destination, block_size=_BLOCK_SIZE, stats=None, on_block=None):
+        """`stats` (a CopyStats) and `on_block` (called with each block written) turn on instrumentation.
+
+        Without either, reads and writes go straight to the source and destination.
+        """
         if source is None or destination is None:
             raise ValueError("Source and destination cannot be None")
         self._source = source
         self._destination = destination
+        self._block_size = block_size
+        self._on_block = on_block
+        self.stats = CopyStats() if stats is None and on_block is not None else stats
 
     def copy(self):
         """Copy characters from source to destination until newline is encountered."""
-        next_char = self._source.read_char()
+        if (_overrides(self._source, ISource, 'read_bytes')
+                and _overrides(self._destination, IDestination, 'write_bytes')):
+            read, write, copy = self._source.read_bytes, self._destination.write_bytes, self._copy_bytes
+        elif _overrides(self._source, ISource, 'read_chars'):
+            read, write, copy = self._source.read_chars, self._block_writer(), self._copy_blocks
+        else:
+            read, write, copy = self._source.read_char, self._destination.write_char, self._copy_chars
+        if self.stats is not None:
+            read, write = self._instrument(read, write)
+        copy(read, write)
+
+    def _instrument(self, read, write):
+        stats, on_block, clock = self.stats, self._on_block, time.perf_counter
+
+        def timed_read(*args):
+            started = clock()
+            data = read(*args)
+            stats.source_seconds += clock() - started
+            stats.reads += 1
+            return data
+
+        def timed_write(data):
+            started = clock()
+            write(data)
+            stats.destination_seconds += clock() - started
+            stats.writes += 1
+            stats.chars += len(data)
+            if on_block is not None:
+                on_block(data)
+
+        return timed_read, timed_write
+
+    def _block_writer(self):
+        if _overrides(self._destination, IDestination, 'write_chars'):
+            return self._destination.write_chars
+        write_char = self._destination.write_char
+
+        def write(chars):
+            for char in chars:
+                write_char(char)
+
+        return write
+
+    @staticmethod
+    def _copy_chars(read, write):
+        next_char = read()
         while next_char != '\n':
-            self._destination.write_char(next_char)
-            next_char = self._source.read_char()
+            write(next_char)
+            next_char = read()
+
+    def _copy_bytes(self, read, write):
+        # Sources stop a block right after the newline, so only the last byte needs checking.
+        while True:
+            block = read(self._block_size)
+            if not len(block):
+                return
+            if block[-1] == 10:
+                if len(block) > 1:
+                    write(block[:-1])
+                return
+            write(block)
+
+    def _copy_blocks(self, read, write):
+        while True:
+            block = read(self._block_size)
+            newline = block.find('\n')
+            if newline != -1:
+                if newline:
+                    write(block[:newline])
+                return
+            if not block:
+                return
+            write(block)
+
 
 class StringSource(ISource):
     def __init__(self, string):
-        self._string = iter(string)
+        self._string = string
+        self._position = 0
 
     def read_char(self):
         """Read the next character or return newline if end of string."""
-        return next(self._string, '\n')
+        if self._position >= len(self._string):
+            return '\n'
+        char = self._string[self._position]
+        self._position += 1
+        return char
+
+    def read_chars(self, count):
+        """Read up to `count` characters, stopping after a newline; newline if end of string."""
+        start = self._position
+        if start >= len(self._string):
+            return '\n'
+        end = min(start + count, len(self._string))
+        newline = self._string.find('\n', start, end)
+        if newline != -1:
+            end = newline + 1
+        self._position = end
+        return self._string[start:end]
+
+
+class FileSource(ISource):
+    """Reads characters from a text file without consuming anything past the first newline."""
+
+    def __init__(self, file):
+        self._file = file
+
+    def read_char(self):
+        """Read the next character or return newline at end of file."""
+        return self._file.read(1) or '\n'
+
+    def read_chars(self, count):
+        """Read up to `count` characters, stopping after a newline; newline at end of file."""
+        return self._file.readline(count) or '\n'
+
+
+class BufferSource(ISource):
+    """Reads from bytes, bytearray, memoryview or mmap without copying the underlying buffer.
+
+    Characters are decoded from `encoding`, which must encode the newline as
+    the single byte 10 as UTF-8 does; read_bytes hands out the raw bytes.
+    """
+
+    def __init__(self, buffer, encoding=_BYTE_ENCODING):
+        self._view = memoryview(buffer).cast('B')
+        self._position = 0
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+
+    def read_char(self):
+        """Read the next character or return newline at end of buffer."""
+        return self.read_chars(1)
+
+    def read_chars(self, count):
+        """Read up to `count` bytes' worth of characters, stopping after a newline; newline at end of buffer.
+
+        A character split by the end of a block is completed from the next bytes.
+        """
+        chars = ''
+        while not chars:
+            if self._position >= len(self._view):
+                self._decoder.decode(b'', final=True)  # raises if the buffer ends inside a character
+                return '\n'
+            chars = self._decoder.decode(self.read_bytes(count))
+        return chars
+
+    def read_bytes(self, count):
+        """Return a memoryview of up to `count` bytes, stopping after a newline; newline at end of buffer."""
+        start = self._position
+        if start >= len(self._view):
+            return b'\n'
+        end = min(start + count, len(self._view))
+        newline = _NEWLINE.search(self._view, start, end)
+        if newline is not None:
+            end = newline.end()
+        self._position = end
+        return self._view[start:end]
+
 
 class BufferDestination(IDestination):
     def __init__(self):
-        self.buffer = []  # Initialize an empty buffer
+        self.buffer = io.StringIO()  # Grows in place instead of holding one string per character
 
     def write_char(self, char):
         """Append character to the buffer."""
-        self.buffer.append(char)
+        self.buffer.write(char)
+
+    def write_chars(self, chars):
+        """Append a block of characters to the buffer."""
+        self.buffer.write(chars)
 
     def get_content(self):
         """Return the content of the buffer as a string."""
-        return ''.join(self.buffer)
+        return self.buffer.getvalue()
+
+
+class BytesDestination(IDestination):
+    """Collects bytes in a preallocated bytearray that doubles when full."""
+
+    def __init__(self, capacity=_INITIAL_CAPACITY, encoding=_BYTE_ENCODING):
+        self._buffer = bytearray(max(capacity, 1))
+        self._length = 0
+        self._encoding = encoding
+
+    def __len__(self):
+        return self._length
+
+    def write_char(self, char):
+        self.write_bytes(char.encode(self._encoding))
+
+    def write_chars(self, chars):
+        self.write_bytes(chars.encode(self._encoding))
+
+    def write_bytes(self, data):
+        end = self._length + len(data)
+        if end > len(self._buffer):
+            self._buffer.extend(bytes(max(end, 2 * len(self._buffer)) - len(self._buffer)))
+        self._buffer[self._length:end] = data
+        self._length = end
+
+    def getvalue(self):
+        """Return the bytes written so far."""
+        return bytes(self._buffer[:self._length])
+
+    def get_content(self):
+        """Return the bytes written so far as a string."""
+        return self._buffer[:self._length].decode(self._encoding)
+
+
+class FileDestination(IDestination):
+    """Writes to a text or binary file; binary files receive blocks without decoding.
+
+    Text meets bytes as `encoding`: characters are encoded for binary files
+    and byte blocks decoded for text files.
+    """
+
+    def __init__(self, file, encoding=_BYTE_ENCODING):
+        self._file = file
+        self._is_text = isinstance(file, io.TextIOBase)
+        self._encoding = encoding
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+
+    def write_char(self, char):
+        self.write_chars(char)
+
+    def write_chars(self, chars):
+        self._file.write(chars if self._is_text else chars.encode(self._encoding))
+
+    def write_bytes(self, data):
+        self._file.write(self._decoder.decode(data) if self._is_text else data)
+
+
+class AsyncSource(ABC):
+    @abstractmethod
+    async def read(self, count):
+        """Read up to `count` characters or bytes, stopping after a newline; empty at end of input."""
+        pass
+
+
+class AsyncDestination(ABC):
+    @abstractmethod
+    async def write(self, data):
+        """Method to write a block of characters or bytes to the destination."""
+        pass
+
+    async def drain(self):
+        """Wait until the destination can take more data; override to apply backpressure."""
+        pass
+
+
+class AsyncCopier:
+    """Copier for non-blocking sources and destinations, run as a coroutine on an event loop."""
+
+    def __init__(self, source, destination, block_size=_BLOCK_SIZE):
+        if source is None or destination is None:
+            raise ValueError("Source and destination cannot be None")
+        self._source = source
+        self._destination = destination
+        self._block_size = block_size
+
+    async def copy(self):
+        """Copy blocks from source to destination until newline or end of input, draining after each write."""
+        # Sources stop a block right after the newline, so only the last item needs checking.
+        while True:
+            block = await self._source.read(self._block_size)
+            if not len(block):
+                return
+            is_last = block[-1:] in _NEWLINES
+            data = block[:-1] if is_last else block
+            if len(data):
+                await self._destination.write(data)
+                await self._destination.drain()
+            if is_last:
+                return
+
+
+class StreamSource(AsyncSource):
+    """Reads bytes from an asyncio.StreamReader such as a socket or pipe.
+
+    Bytes received after the newline stay buffered in the source for the next read.
+    """
+
+    def __init__(self, reader):
+        self._reader = reader
+        self._pending = b''
+
+    async def read(self, count):
+        data = self._pending or await self._reader.read(count)
+        end = min(count, len(data))
+        newline = data.find(b'\n', 0, end)
+        if newline != -1:
+            end = newline + 1
+        self._pending = data[end:]
+        return data[:end]
+
+
+class StreamDestination(AsyncDestination):
+    """Writes bytes to an asyncio.StreamWriter, waiting on its drain() for backpressure."""
+
+    def __init__(self, writer):
+        self._writer = writer
+
+    async def write(self, data):
+        self._writer.write(data)
+
+    async def drain(self):
+        await self._writer.drain()
+
+
+class AsyncDestinationAdapter(AsyncDestination):
+    """Lets AsyncCopier write into any IDestination: bytes-like blocks go to write_bytes, text to write_chars."""
+
+    def __init__(self, destination):
+        self._destination = destination
+
+    async def write(self, data):
+        if isinstance(data, str):
+            self._destination.write_chars(data)
+        else:
+            self._destination.write_bytes(data)
+
+
+async def copy_all(copiers, limit=None):
+    """Run AsyncCopier.copy for every copier concurrently, at most `limit` at a time."""
+    if limit is None:
+        await asyncio.gather(*(copier.copy() for copier in copiers))
+        return
+    semaphore = asyncio.Semaphore(limit)
 
+    async def copy(copier):
+        async with semaphore:
+            await copier.copy()
 
+    await asyncio.gather(*map(copy, copiers))
@@ -1,8 +1,14 @@
+import asyncio
+import io
+import mmap
+
 import pytest
 from unittest.mock import Mock, call
 
 # Import the classes under test from their module
-from char_copy import Copier, ISource, IDestination
+from char_copy import (AsyncCopier, AsyncDestination, AsyncDestinationAdapter, BufferDestination, BufferSource,
+                       BytesDestination, Copier, CopyStats, FileDestination, FileSource, ISource, IDestination,
+                       StreamSource, StringSource, copy_all)
 
 # Test that a ValueError is raised when source is None
 def test_ctor_given_null_source_should_raise_value_error():
@@ -42,3 +48,240 @@ def test_copy_given_many_chars_should_copy_all_chars_until_newline():
     assert source.read_char.call_count == 5
     expected_calls = [call('a'), call('b'), call('c'), call('d')]
     destination.write_char.assert_has_calls(expected_calls, any_order=False)
+
+# Test that block-capable sources and destinations are copied a block at a time
+def test_copy_given_block_source_and_destination_should_copy_blocks_until_newline():
+    source = StringSource("abcdef\nghi")
+    destination = BufferDestination()
+    copier = Copier(source, destination, block_size=4)
+
+    copier.copy()
+
+    assert destination.get_content() == 'abcdef'
+    assert source.read_chars(10) == 'ghi'
+
+# Test that a block source still feeds a destination that only writes single characters
+def test_copy_given_block_source_and_char_destination_should_write_each_char():
+    destination = Mock(spec=IDestination)
+    copier = Copier(StringSource("abc"), destination)
+
+    copier.copy()
+
+    destination.write_char.assert_has_calls([call('a'), call('b'), call('c')], any_order=False)
+
+# Test that a source implementing only read_char gets the default block read
+def test_default_read_chars_should_stop_after_newline():
+    class CharOnlySource(ISource):
+        def __init__(self):
+            self._chars = iter("ab\ncd")
+
+        def read_char(self):
+            return next(self._chars, '\n')
+
+    source = CharOnlySource()
+
+    assert source.read_chars(10) == 'ab\n'
+    assert source.read_chars(1) == 'c'
+
+# Test that a source which ends without a newline stops the copy
+def test_copy_given_empty_block_should_stop():
+    class EmptyBlockSource(ISource):
+        def read_char(self):
+            return '\n'
+
+        def read_chars(self, count):
+            return ''
+
+    destination = BufferDestination()
+
+    Copier(EmptyBlockSource(), destination).copy()
+
+    assert destination.get_content() == ''
+
+# Test that a file source stops at the newline and leaves the rest of the file unread
+def test_copy_given_file_source_should_stop_at_newline_without_consuming_the_rest():
+    file = io.StringIO("hello\nworld")
+    destination = BufferDestination()
+
+    Copier(FileSource(file), destination, block_size=3).copy()
+
+    assert destination.get_content() == 'hello'
+    assert file.read() == 'world'
+
+# Test that buffer sources hand memoryview slices to byte destinations without decoding
+def test_copy_given_buffer_source_and_bytes_destination_should_copy_bytes_until_newline():
+    source = BufferSource(bytearray(b'abc\xe9def\nrest'))
+    destination = BytesDestination(capacity=2)
+
+    Copier(source, destination, block_size=3).copy()
+
+    assert destination.getvalue() == b'abc\xe9def'
+    assert len(destination) == 7
+
+# Test that a memory-mapped file can be copied into a binary file
+def test_copy_given_mmap_source_and_binary_file_destination_should_copy_until_newline(tmp_path):
+    path = tmp_path / 'input.txt'
+    path.write_bytes(b'mapped line\nnext')
+    output = io.BytesIO()
+
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        Copier(BufferSource(mapped), FileDestination(output)).copy()
+
+    assert output.getvalue() == b'mapped line'
+
+# Test that a buffer source without a newline copies everything into a text file
+def test_copy_given_buffer_source_without_newline_and_text_file_destination_should_copy_all():
+    output = io.StringIO()
+
+    Copier(BufferSource(b'no newline'), FileDestination(output), block_size=4).copy()
+
+    assert output.getvalue() == 'no newline'
+
+# Test that text outside Latin-1 is encoded as UTF-8 for byte destinations
+@pytest.mark.parametrize("block_size", [1, 3, 4096])
+def test_copy_given_non_latin1_text_and_byte_destinations_should_encode_utf8(block_size):
+    destination, output = BytesDestination(), io.BytesIO()
+
+    Copier(StringSource('price €5\nrest'), destination, block_size=block_size).copy()
+    Copier(StringSource('price €5\nrest'), FileDestination(output), block_size=block_size).copy()
+
+    assert destination.getvalue() == output.getvalue() == 'price €5'.encode()
+    assert destination.get_content() == 'price €5'
+
+# Test that UTF-8 split across blocks is decoded whole for text destinations
+@pytest.mark.parametrize("block_size", [1, 2, 3, 4096])
+def test_copy_given_multibyte_utf8_buffer_and_text_destinations_should_decode_it(block_size):
+    data = 'héllo€ 😀\nrest'.encode()
+    destination, output = BufferDestination(), io.StringIO()
+
+    Copier(BufferSource(data), destination, block_size=block_size).copy()
+    Copier(BufferSource(data), FileDestination(output), block_size=block_size).copy()
+
+    assert destination.get_content() == output.getvalue() == 'héllo€ 😀'
+
+# Test that a buffer source reads one whole character at a time
+def test_buffer_source_read_char_should_return_whole_characters():
+    source = BufferSource('é€'.encode())
+
+    assert [source.read_char() for _ in range(3)] == ['é', '€', '\n']
+
+# Test that sources and destinations can be given another encoding
+def test_copy_given_encoding_should_use_it_between_text_and_bytes():
+    encoded, decoded = BytesDestination(encoding='utf-16-le'), BufferDestination()
+
+    Copier(StringSource('café\n'), encoded).copy()
+    Copier(BufferSource(b'caf\xe9\n', encoding='latin-1'), decoded).copy()
+
+    assert encoded.getvalue() == 'café'.encode('utf-16-le')
+    assert decoded.get_content() == 'café'
+
+# Test that an instrumented copier counts characters, reads and writes
+def test_copy_given_stats_should_count_chars_reads_and_writes():
+    stats = CopyStats()
+    copier = Copier(StringSource("abcdef\nghi"), BufferDestination(), block_size=4, stats=stats)
+
+    copier.copy()
+
+    assert (stats.chars, stats.reads, stats.writes) == (6, 2, 2)
+    assert stats.source_seconds >= 0 and stats.destination_seconds >= 0
+
+# Test that the per-character path is instrumented one call at a time
+def test_copy_given_stats_and_char_source_should_count_each_call():
+    source = Mock(spec=ISource)
+    source.read_char.side_effect = ['a', 'b', '\n']
+    destination = Mock(spec=IDestination)
+    copier = Copier(source, destination, stats=CopyStats())
+
+    copier.copy()
+
+    assert (copier.stats.chars, copier.stats.reads, copier.stats.writes) == (2, 3, 2)
+    destination.write_char.assert_has_calls([call('a'), call('b')])
+
+# Test that the block hook sees every block written and gets a stats object
+def test_copy_given_block_hook_should_call_it_for_every_block():
+    blocks = []
+    copier = Copier(BufferSource(b'abcdefg\n'), BytesDestination(), block_size=3,
+                    on_block=lambda block: blocks.append(bytes(block)))
+
+    copier.copy()
+
+    assert blocks == [b'abc', b'def', b'g']
+    assert copier.stats.chars == 7
+
+# Test that copiers are uninstrumented by default
+def test_copy_without_stats_should_not_create_stats():
+    copier = Copier(StringSource("abc"), BufferDestination())
+
+    copier.copy()
+
+    assert copier.stats is None
+
+def _stream_reader(data):
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+# Test that the async copier stops at the newline and keeps the rest buffered in the source
+def test_async_copy_given_stream_source_should_copy_until_newline():
+    destination = BytesDestination()
+
+    async def run():
+        source = StreamSource(_stream_reader(b'abcdef\nghi'))
+        await AsyncCopier(source, AsyncDestinationAdapter(destination), block_size=4).copy()
+        rest = []
+        while block := await source.read(10):
+            rest.append(block)
+        return b''.join(rest)
+
+    rest = asyncio.run(run())
+
+    assert destination.getvalue() == b'abcdef'
+    assert rest == b'ghi'
+
+# Test that the async copier drains the destination after every block it writes
+def test_async_copy_given_destination_should_drain_after_each_write():
+    class RecordingDestination(AsyncDestination):
+        def __init__(self):
+            self.calls = []
+
+        async def write(self, data):
+            self.calls.append(bytes(data))
+
+        async def drain(self):
+            self.calls.append('drain')
+
+    destination = RecordingDestination()
+
+    async def run():
+        await AsyncCopier(StreamSource(_stream_reader(b'abcde\n')), destination, block_size=3).copy()
+
+    asyncio.run(run())
+
+    assert destination.calls == [b'abc', 'drain', b'de', 'drain']
+
+# Test that UTF-8 split across stream reads reaches a text destination intact
+def test_async_copy_given_multibyte_utf8_and_text_destination_should_decode_it():
+    destination = BufferDestination()
+
+    async def run():
+        source = StreamSource(_stream_reader('€uro ñ\n'.encode()))
+        await AsyncCopier(source, AsyncDestinationAdapter(destination), block_size=1).copy()
+
+    asyncio.run(run())
+
+    assert destination.get_content() == '€uro ñ'
+
+# Test that thousands of async copies can run concurrently on one event loop
+def test_copy_all_given_many_copiers_should_copy_each_line():
+    async def run():
+        destinations = [BytesDestination() for _ in range(2000)]
+        copiers = [AsyncCopier(StreamSource(_stream_reader(b'line %d\nmore' % index)),
+                               AsyncDestinationAdapter(destination))
+                   for index, destination in enumerate(destinations)]
+        await copy_all(copiers, limit=500)
+        return destinations
+
+    destinations = asyncio.run(run())
+
+    assert [destination.getvalue() for destination in destinations] == [b'line %d' % index for index in range(2000)]
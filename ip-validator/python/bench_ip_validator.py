@@ -0,0 +1,61 @@
+"""Throughput of the IPv4 validators.
+
+Run with `python bench_ip_validator.py`.
+"""
+import random
+import time
+
+from ip_validator import CachedIpValidator, IpValidator
+
+ADDRESS_COUNT = 1_000_000
+DISTINCT_ADDRESSES = 100_000
+ZIPF_EXPONENT = 1.1
+CACHE_SIZE = 4096
+
+
+def sample_addresses(count, seed=42):
+    rng = random.Random(seed)
+    octets = [str(octet) for octet in range(256)] + ['256', '01', '300', '']
+    return ['.'.join(rng.choice(octets) for _ in range(4)) for _ in range(count)]
+
+
+def zipf_addresses(count, seed=7):
+    # A few hot addresses dominate, as in real traffic.
+    rng = random.Random(seed)
+    distinct = sample_addresses(DISTINCT_ADDRESSES, seed)
+    weights = [1 / rank ** ZIPF_EXPONENT for rank in range(1, len(distinct) + 1)]
+    return rng.choices(distinct, weights=weights, k=count)
+
+
+def report_latency(name, validator, addresses):
+    validate = validator.validate_ipv4_address
+    started = time.perf_counter()
+    for ip_address in addresses:
+        validate(ip_address)
+    elapsed = time.perf_counter() - started
+    print(f"{name:<24} {elapsed / len(addresses) * 1e9:8.0f} ns/call")
+
+
+def report(name, func, addresses):
+    started = time.perf_counter()
+    result = func(addresses)
+    elapsed = time.perf_counter() - started
+    print(f"{name:<24} {len(addresses) / elapsed / 1e6:6.2f} M addresses/s  valid={sum(result)}")
+
+
+def main():
+    validator = IpValidator()
+    addresses = sample_addresses(ADDRESS_COUNT)
+    report("validate_ipv4_address", lambda ips: [validator.validate_ipv4_address(ip) for ip in ips], addresses)
+    report("validate_many", validator.validate_many, addresses)
+
+    print(f"Zipf(s={ZIPF_EXPONENT}) over {DISTINCT_ADDRESSES} addresses:")
+    skewed = zipf_addresses(ADDRESS_COUNT)
+    cached = CachedIpValidator(CACHE_SIZE)
+    report_latency("uncached", validator, skewed)
+    report_latency(f"cached ({CACHE_SIZE} entries)", cached, skewed)
+    print(cached.cache_info())
+
+
+if __name__ == '__main__':
+    main()
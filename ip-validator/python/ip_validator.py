@@ -1,3 +1,30 @@
+import mmap
+import re
+import sys
+import time
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+from functools import lru_cache
+from itertools import repeat
+from operator import lt
+from socket import inet_aton
+
+_SCAN_CHUNK = 1 << 24  # bytes of a log file handed to one worker task
+_UNSIGNED_TYPECODES = 'BHILQ'
+
+# Octets without leading zeros; the last one also excludes 0 and 255.
+_OCTET = r'(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])'
+_HOST_OCTET = r'(?:25[0-4]|2[0-4][0-9]|1[0-9][0-9]|[1-9][0-9]?)'
+_IPV4_PATTERN = re.compile(r'(?:%s\.){3}%s' % (_OCTET, _HOST_OCTET))
+_CIDR_PATTERN = re.compile(r'((?:%s\.){3}%s)/(3[0-2]|[12][0-9]|[0-9])' % (_OCTET, _OCTET))
+# Dotted-quad candidates in raw log bytes.  The first alternative captures the
+# valid ones, so findall counts valid and invalid without a Python-level loop.
+_LOG_CANDIDATE_PATTERN = re.compile((
+    r'(?<![0-9])(?<![0-9]\.)(?:(%s)(?!\.?[0-9])|[0-9]+(?:\.[0-9]+){3}(?!\.?[0-9]))'
+    % _IPV4_PATTERN.pattern).encode('ascii'))
+
+
 class IpValidator:
     def validate_ipv4_address(self, ip_address):
         if not ip_address or not isinstance(ip_address, str):
@@ -17,3 +44,199 @@ class IpValidator:
         # Check if the last part is '0' or '255'
         return not (parts[3] == '0' or parts[3] == '255')
 
+    def validate_many(self, ip_addresses):
+        """Validate every address in `ip_addresses`, returning a list of bools.
+
+        Gives the same answers as validate_ipv4_address, but ASCII strings are
+        checked in a single pass by one precompiled pattern.
+        """
+        fullmatch = _IPV4_PATTERN.fullmatch
+        return [isinstance(ip_address, str)
+                and (fullmatch(ip_address) is not None if ip_address.isascii()
+                     else self.validate_ipv4_address(ip_address))
+                for ip_address in ip_addresses]
+
+    def parse_ipv4_address(self, ip_address):
+        """Return a valid address as an unsigned 32-bit int, or None when it is invalid."""
+        if isinstance(ip_address, str) and _IPV4_PATTERN.fullmatch(ip_address):
+            return int.from_bytes(inet_aton(ip_address), 'big')
+        if not self.validate_ipv4_address(ip_address):
+            return None
+        # Only non-ASCII digits, which int() accepts but inet_aton does not, get here.
+        first, second, third, fourth = ip_address.split('.')
+        return int(first) << 24 | int(second) << 16 | int(third) << 8 | int(fourth)
+
+    def parse_many(self, ip_addresses):
+        """Parse every address into an array('I'), using 0 for invalid ones.
+
+        0 is 0.0.0.0, which is never valid because its last octet is 0.
+        """
+        fullmatch = _IPV4_PATTERN.fullmatch
+        parse = self.parse_ipv4_address
+        addresses = array('I')
+        addresses.frombytes(b''.join([
+            inet_aton(ip_address) if isinstance(ip_address, str) and fullmatch(ip_address)
+            else (parse(ip_address) or 0).to_bytes(4, 'big')
+            for ip_address in ip_addresses]))
+        if sys.byteorder == 'little':
+            addresses.byteswap()
+        return addresses
+
+
+CacheInfo = namedtuple('CacheInfo', 'hits misses evictions maxsize currsize')
+
+
+class CachedIpValidator(IpValidator):
+    """IpValidator that remembers the last `maxsize` string addresses it validated.
+
+    Backed by functools.lru_cache, so lookups are thread-safe and the plain
+    IpValidator path is left untouched for callers that do not opt in.
+    """
+
+    def __init__(self, maxsize=4096):
+        if maxsize <= 0:
+            raise ValueError("Cache size must be positive")
+        self._cached_validate = lru_cache(maxsize)(super().validate_ipv4_address)
+
+    def validate_ipv4_address(self, ip_address):
+        if isinstance(ip_address, str):
+            return self._cached_validate(ip_address)
+        return super().validate_ipv4_address(ip_address)
+
+    def cache_info(self):
+        info = self._cached_validate.cache_info()
+        # Every miss inserts one entry, so whatever is no longer held was evicted.
+        return CacheInfo(info.hits, info.misses, info.misses - info.currsize, info.maxsize, info.currsize)
+
+    def cache_clear(self):
+        self._cached_validate.cache_clear()
+
+
+class CidrIndex:
+    """Sorted, merged address intervals of CIDR blocks for bisect membership checks."""
+
+    def __init__(self, blocks):
+        self._starts = array('I')
+        # _limits[i + 1] is the exclusive end of interval i; _limits[0] = 0 makes
+        # addresses below the first interval fail the same `address < limit` test.
+        self._limits = array('Q', [0])
+        for start, limit in sorted(self._parse_block(block) for block in blocks):
+            # 0.0.0.0 is never a valid address, which also keeps parse_many's 0 out.
+            start = max(start, 1)
+            if start >= limit:
+                continue
+            if self._starts and start <= self._limits[-1]:
+                self._limits[-1] = max(self._limits[-1], limit)
+            else:
+                self._starts.append(start)
+                self._limits.append(limit)
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __contains__(self, address):
+        if isinstance(address, str):
+            address = IpValidator().parse_ipv4_address(address)
+            if address is None:
+                return False
+        # Below the first interval bisect_right gives 0 and _limits[0] is 0, so
+        # only the lower bound needs checking for negative ints.
+        return 0 <= address < self._limits[bisect_right(self._starts, address)]
+
+    def contains_many(self, addresses):
+        """Membership of each int in `addresses` (e.g. parse_many's array) as a bytearray of 0/1.
+
+        `addresses` is iterated once, so it may be a generator.  Unsigned
+        arrays hold no negative values and are re-iterable, so they are
+        checked in two C-level passes instead of one Python-level one.
+        """
+        starts, limits = self._starts, self._limits
+        if isinstance(addresses, array) and addresses.typecode in _UNSIGNED_TYPECODES:
+            intervals = map(bisect_right, repeat(starts), addresses)
+            return bytearray(map(lt, addresses, map(limits.__getitem__, intervals)))
+        return bytearray(0 <= address < limits[bisect_right(starts, address)] for address in addresses)
+
+    @staticmethod
+    def _parse_block(block):
+        match = _CIDR_PATTERN.fullmatch(block)
+        if match is None:
+            raise ValueError(f"Invalid CIDR block: {block}")
+        network, prefix_length = match.groups()
+        first, second, third, fourth = network.split('.')
+        start = int(first) << 24 | int(second) << 16 | int(third) << 8 | int(fourth)
+        host_mask = (1 << (32 - int(prefix_length))) - 1
+        if start & host_mask:
+            raise ValueError(f"CIDR block has host bits set: {block}")
+        return start, (start | host_mask) + 1
+
+
+class ChunkStats(namedtuple('ChunkStats', 'path start stop valid invalid seconds')):
+    """Counts of valid and invalid IPv4 candidates in bytes [start, stop) of a log file."""
+
+    @property
+    def megabytes_per_second(self):
+        return (self.stop - self.start) / self.seconds / 1e6 if self.seconds else float('inf')
+
+
+def scan_log_files(paths, workers=None, chunk_size=_SCAN_CHUNK):
+    """Yield ChunkStats for every chunk of every file in `paths`, in file order.
+
+    Files are split at the first newline after each `chunk_size` bytes, and
+    each worker memory-maps its file and scans only its own byte range.
+    """
+    # Imported here so plain IpValidator callers do not load multiprocessing.
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(workers) as executor:
+        for path in paths:
+            yield from executor.map(_scan_log_chunk, *zip(*_line_chunks(path, chunk_size)))
+
+
+def _line_chunks(path, chunk_size):
+    with open(path, 'rb') as file:
+        size = file.seek(0, 2)
+        if size == 0:
+            return [(path, 0, 0)]
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            chunks, start = [], 0
+            while start < size:
+                newline = mapped.find(b'\n', start + chunk_size - 1)
+                stop = size if newline == -1 else newline + 1
+                chunks.append((path, start, stop))
+                start = stop
+            return chunks
+
+
+def _scan_log_chunk(path, start, stop):
+    started = time.perf_counter()
+    if start == stop:
+        return ChunkStats(path, start, stop, 0, 0, 0.0)
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        found = _LOG_CANDIDATE_PATTERN.findall(mapped, start, stop)
+    invalid = found.count(b'')
+    return ChunkStats(path, start, stop, len(found) - invalid, invalid, time.perf_counter() - started)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Count valid and invalid IPv4 addresses in log files.")
+    parser.add_argument('paths', nargs='+', metavar='FILE')
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=_SCAN_CHUNK, help="bytes per worker task")
+    parser.add_argument('--stats', action='store_true', help="print per-chunk throughput to stderr")
+    args = parser.parse_args(argv)
+
+    totals = {path: [0, 0] for path in args.paths}
+    for stats in scan_log_files(args.paths, args.workers, args.chunk_size):
+        totals[stats.path][0] += stats.valid
+        totals[stats.path][1] += stats.invalid
+        if args.stats:
+            print(f"{stats.path}[{stats.start}:{stats.stop}] {stats.megabytes_per_second:.1f} MB/s",
+                  file=sys.stderr)
+    for path, (valid, invalid) in totals.items():
+        print(f"{path}\tvalid={valid}\tinvalid={invalid}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,6 @@
 import pytest
-from ip_validator import IpValidator  # Replace 'your_module' with the actual name of your Python module
+import threading
+from ip_validator import CachedIpValidator, CidrIndex, IpValidator, main, scan_log_files  # Replace 'your_module' with the actual name of your Python module
 
 # Test data for each category
 BASIC_FORMAT_TESTS = [
@@ -91,3 +92,174 @@ def test_validate_ipv4_address_edge_cases(ip_address, expected_result):
     # Assert
     assert actual == expected_result
 
+
+ALL_TESTS = BASIC_FORMAT_TESTS + RANGE_TESTS + LEADING_ZERO_TESTS + NETWORK_BROADCAST_ADDRESS_TESTS + EDGE_CASE_TESTS
+
+def test_validate_many_matches_single_address_validation():
+    # Arrange
+    validator = IpValidator()
+    ip_addresses = [ip_address for ip_address, _ in ALL_TESTS] + ["1.2.3.254", "1.2.3.4 ", "1.2.3.٤", 16843009]
+
+    # Act
+    actual = validator.validate_many(ip_addresses)
+
+    # Assert
+    assert actual == [validator.validate_ipv4_address(ip_address) for ip_address in ip_addresses]
+    assert actual[:len(ALL_TESTS)] == [expected for _, expected in ALL_TESTS]
+
+def test_validate_many_accepts_any_iterable():
+    # Arrange
+    validator = IpValidator()
+
+    # Act
+    actual = validator.validate_many(ip for ip in ["10.0.0.1", "10.0.0.0"])
+
+    # Assert
+    assert actual == [True, False]
+
+LOG_LINES = [
+    b"GET /index.html from 10.0.0.1 status 200\n",
+    b"GET /admin from 192.168.01.1 status 403\n",
+    b"broadcast 255.255.255.255, retry 10.0.0.1.\n",
+    b"build 1.2.3.4.5 is not an address\n",
+]
+
+def test_scan_log_files_counts_candidates_per_chunk_on_line_boundaries(tmp_path):
+    # Arrange
+    path = tmp_path / "access.log"
+    path.write_bytes(b"".join(LOG_LINES) * 50)
+
+    # Act
+    chunks = list(scan_log_files([path], workers=2, chunk_size=100))
+
+    # Assert
+    assert sum(chunk.valid for chunk in chunks) == 100
+    assert sum(chunk.invalid for chunk in chunks) == 100
+    assert all(path.read_bytes()[chunk.stop - 1:chunk.stop] == b"\n" for chunk in chunks)
+    assert [chunk.start for chunk in chunks[1:]] == [chunk.stop for chunk in chunks[:-1]]
+
+def test_command_line_prints_totals_per_file(tmp_path, capsys):
+    # Arrange
+    log = tmp_path / "access.log"
+    log.write_bytes(b"".join(LOG_LINES))
+    empty = tmp_path / "empty.log"
+    empty.write_bytes(b"")
+
+    # Act
+    main([str(log), str(empty), "--workers", "1"])
+
+    # Assert
+    assert capsys.readouterr().out.splitlines() == [
+        f"{log}\tvalid=2\tinvalid=2",
+        f"{empty}\tvalid=0\tinvalid=0",
+    ]
+
+@pytest.mark.parametrize("ip_address,expected_result", [
+    ("1.1.1.1", 0x01010101),
+    ("192.168.1.1", 0xC0A80101),
+    ("255.255.255.254", 0xFFFFFFFE),
+    ("192.168.1.0", None),
+    ("01.1.1.1", None),
+    (None, None),
+])
+def test_parse_ipv4_address(ip_address, expected_result):
+    # Arrange
+    validator = IpValidator()
+
+    # Act
+    actual = validator.parse_ipv4_address(ip_address)
+
+    # Assert
+    assert actual == expected_result
+
+def test_parse_many_uses_zero_for_invalid_addresses():
+    # Arrange
+    validator = IpValidator()
+
+    # Act
+    actual = validator.parse_many(["10.0.0.1", "10.0.0.256", "0.0.0.1"])
+
+    # Assert
+    assert actual.typecode == 'I'
+    assert list(actual) == [0x0A000001, 0, 1]
+
+def test_cidr_index_membership():
+    # Arrange
+    index = CidrIndex(["10.0.0.0/8", "192.168.1.0/24", "192.168.0.0/24", "10.1.0.0/16", "8.8.8.8/32"])
+
+    # Act / Assert
+    assert len(index) == 3  # overlapping and adjacent blocks are merged
+    assert "10.200.3.4" in index
+    assert "192.168.1.77" in index
+    assert "8.8.8.8" in index
+    assert "8.8.8.9" not in index
+    assert "11.0.0.1" not in index
+    assert "not.an.ip" not in index
+    assert index.contains_many(IpValidator().parse_many(["10.0.0.1", "9.9.9.9", "192.168.0.1"])) == bytearray([1, 0, 1])
+
+def test_cidr_index_rejects_ints_outside_the_address_space():
+    index = CidrIndex(["10.0.0.0/8", "0.0.0.0/0"])
+
+    assert -5 not in CidrIndex(["10.0.0.0/8"])
+    assert -1 not in index and 2 ** 32 not in index
+    assert index.contains_many([-5, 5, 2 ** 32]) == bytearray([0, 1, 0])
+
+def test_cidr_index_contains_many_takes_iterators():
+    index = CidrIndex(["10.0.0.0/8"])
+    addresses = [167772161, 5, -5, 167772162]
+
+    assert index.contains_many(address for address in addresses) == bytearray([1, 0, 0, 1])
+    assert index.contains_many(iter(addresses)) == bytearray([1, 0, 0, 1])
+
+@pytest.mark.parametrize("block", ["10.0.0.0", "10.0.0.0/33", "10.0.0.1/8", "256.0.0.0/8"])
+def test_cidr_index_rejects_invalid_blocks(block):
+    with pytest.raises(ValueError):
+        CidrIndex([block])
+
+@pytest.mark.parametrize("ip_address,expected_result", ALL_TESTS)
+def test_cached_validator_keeps_results(ip_address, expected_result):
+    # Arrange
+    validator = CachedIpValidator(maxsize=8)
+
+    # Act
+    first, second = validator.validate_ipv4_address(ip_address), validator.validate_ipv4_address(ip_address)
+
+    # Assert
+    assert first == second == expected_result
+
+def test_cached_validator_counts_hits_misses_and_evictions():
+    # Arrange
+    validator = CachedIpValidator(maxsize=2)
+
+    # Act
+    for ip_address in ["1.1.1.1", "1.1.1.1", "2.2.2.2", "3.3.3.3", "1.1.1.1", None]:
+        validator.validate_ipv4_address(ip_address)
+
+    # Assert
+    assert validator.cache_info() == (1, 4, 2, 2, 2)
+
+def test_cached_validator_is_safe_across_threads():
+    # Arrange
+    validator = CachedIpValidator(maxsize=16)
+    ip_addresses = [f"10.0.{i % 40}.{i % 250 + 1}" for i in range(2000)]
+    expected = [IpValidator().validate_ipv4_address(ip_address) for ip_address in ip_addresses]
+    results = {}
+
+    def validate(worker):
+        results[worker] = [validator.validate_ipv4_address(ip_address) for ip_address in ip_addresses]
+
+    # Act
+    threads = [threading.Thread(target=validate, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Assert
+    assert all(result == expected for result in results.values())
+    info = validator.cache_info()
+    assert info.hits + info.misses == 4 * len(ip_addresses)
+
+def test_cached_validator_rejects_non_positive_size():
+    with pytest.raises(ValueError):
+        CachedIpValidator(maxsize=0)
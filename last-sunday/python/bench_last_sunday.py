@@ -0,0 +1,48 @@
+"""Last-Sunday calendars for a multi-century range: datetime baseline vs the cycle-table engine.
+
+Run with `python bench_last_sunday.py`.
+"""
+import io
+import time
+from datetime import datetime, timedelta
+
+from last_sunday import last_sunday, last_sundays_range, write_last_sundays
+
+START_YEAR, END_YEAR = 1600, 9000
+
+
+def datetime_last_sunday(year):
+    # The original datetime/strftime implementation, kept as the baseline.
+    last_sundays = []
+    for month in range(1, 13):
+        if month == 12:
+            next_month = datetime(year + 1, 1, 1)
+        else:
+            next_month = datetime(year, month + 1, 1)
+        last_day_of_month = next_month - timedelta(days=1)
+        days_to_subtract = (last_day_of_month.weekday() + 1) % 7
+        last_sundays.append((last_day_of_month - timedelta(days=days_to_subtract)).strftime('%Y-%m-%d'))
+    return last_sundays
+
+
+def report(name, func):
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    count = result if isinstance(result, int) else len(result)
+    print(f"{name:<32} {elapsed * 1e3:8.1f} ms  dates={count}")
+
+
+def main():
+    years = range(START_YEAR, END_YEAR + 1)
+    report("datetime per year", lambda: [day for year in years for day in datetime_last_sunday(year)])
+    report("last_sunday per year", lambda: [day for year in years for day in last_sunday(year)])
+    report("last_sundays_range (strings)", lambda: last_sundays_range(START_YEAR, END_YEAR))
+    report("last_sundays_range (ordinals)", lambda: last_sundays_range(START_YEAR, END_YEAR, as_ordinals=True))
+    report("write_last_sundays (bytes)", lambda: write_last_sundays(START_YEAR, END_YEAR, io.BytesIO()))
+    report("write_last_sundays (ordinals)",
+           lambda: write_last_sundays(START_YEAR, END_YEAR, io.BytesIO(), as_ordinals=True))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,21 +1,205 @@
-from datetime import datetime, timedelta
+import sys
+from array import array
+from functools import lru_cache
+
+MONDAY, TUESDAY, WEDNESDAY, THURSDAY, FRIDAY, SATURDAY, SUNDAY = range(7)
+LAST = -1
+
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_CYCLE_YEARS = 400  # the Gregorian calendar repeats its weekdays every 400 years
+_CYCLE_DAYS = 146097  # days in one 400-year cycle
+_MIN_YEAR, _MAX_YEAR = 1, 9999
+_WRITE_CHUNK = 1 << 16  # bytes buffered before each write to a file-like output
+# '-MM-DD' for every month and day, so dates are built by one concatenation.
+_MONTH_DAY_SUFFIXES = [[f"-{month:02d}-{day:02d}" for day in range(32)] for month in range(1, 13)]
+
+
+class WeekdayRule:
+    """The `occurrence`-th `weekday` of a month, e.g. WeekdayRule(TUESDAY, 2) or WeekdayRule(FRIDAY, LAST).
+
+    Weekdays follow date.weekday() (MONDAY == 0).  Occurrences 1 to 4 count
+    from the start of the month and -1 (LAST) to -4 from the end, so every
+    month has exactly one matching day.
+    """
+
+    def __init__(self, weekday, occurrence=LAST):
+        if weekday not in range(7):
+            raise ValueError("The weekday must be between MONDAY (0) and SUNDAY (6).")
+        if occurrence not in (1, 2, 3, 4, -1, -2, -3, -4):
+            raise ValueError("The occurrence must be 1 to 4, or -1 (LAST) to -4.")
+        self.weekday = weekday
+        self.occurrence = occurrence
+
+    def day_of_month(self, year, month):
+        return _rule_table(self.weekday, self.occurrence)[0][_row(year, month)]
+
+    def date(self, year, month):
+        """The matching day as a 'YYYY-MM-DD' string, formatted like last_sunday."""
+        return str(year) + _MONTH_DAY_SUFFIXES[month - 1][self.day_of_month(year, month)]
+
+    def ordinal(self, year, month):
+        """The matching day as a date.toordinal() value."""
+        return _days_before_year(year) + _rule_table(self.weekday, self.occurrence)[1][_row(year, month)]
+
+    def iter_range(self, start_year, end_year, as_ordinals=False):
+        """Lazily yield the matching day of every month from start_year to end_year inclusive."""
+        _check_year_range(start_year, end_year)
+        return self._iter_range(start_year, end_year, as_ordinals)
+
+    def write_range(self, start_year, end_year, out, as_ordinals=False):
+        """Write the matching day of every month from start_year to end_year inclusive to `out`.
+
+        Dates are written as ASCII 'YYYY-MM-DD' lines, or with `as_ordinals`
+        as native int32 date ordinals.  `out` is a bytearray to append to or a
+        binary file-like object.  Each year's bytes are assembled from
+        precomputed tables in one join, and ordinals a whole cycle at a time,
+        with no per-date objects.  Returns the number of dates written.
+        """
+        _check_year_range(start_year, end_year)
+        if as_ordinals:
+            pieces = _ordinal_blocks(self.weekday, self.occurrence, start_year, end_year)
+        else:
+            line_parts = _rule_line_parts(self.weekday, self.occurrence)
+            # Joining b'' and the twelve tails puts the year in front of each tail.
+            pieces = (str(year).encode('ascii').join(line_parts[year % _CYCLE_YEARS])
+                      for year in range(start_year, end_year + 1))
+        chunk = out if isinstance(out, bytearray) else bytearray()
+        for piece in pieces:
+            chunk += piece
+            if chunk is not out and len(chunk) >= _WRITE_CHUNK:
+                out.write(chunk)
+                chunk.clear()
+        if chunk is not out and chunk:
+            out.write(chunk)
+        return max(end_year - start_year + 1, 0) * 12
+
+    def _iter_range(self, start_year, end_year, as_ordinals):
+        if as_ordinals:
+            for block in _ordinal_blocks(self.weekday, self.occurrence, start_year, end_year):
+                yield from block
+            return
+        days_of_month = _rule_table(self.weekday, self.occurrence)[0]
+        for year in range(start_year, end_year + 1):
+            row = year % _CYCLE_YEARS * 12
+            prefix = str(year)
+            for month in range(12):
+                yield prefix + _MONTH_DAY_SUFFIXES[month][days_of_month[row + month]]
+
+
+_LAST_SUNDAY = WeekdayRule(SUNDAY, LAST)
+
 
 def last_sunday(year):
     # Check if the input is an integer
     if not isinstance(year, int):
         raise ValueError("The year must be an integer.")
 
-    last_sundays = []
-    for month in range(1, 13):
-        if month == 12:
-            next_month = datetime(year + 1, 1, 1)
+    return list(_LAST_SUNDAY.iter_range(year, year))
+
+
+def last_sundays_range(start_year, end_year, as_ordinals=False):
+    """Last Sunday of every month from start_year to end_year inclusive.
+
+    Returns 'YYYY-MM-DD' strings in the same format as last_sunday, or with
+    `as_ordinals` an array('i') of date.toordinal() values.
+    """
+    dates = _LAST_SUNDAY.iter_range(start_year, end_year, as_ordinals)
+    return array('i', dates) if as_ordinals else list(dates)
+
+
+def write_last_sundays(start_year, end_year, out, as_ordinals=False):
+    """Write the last Sunday of every month to `out`; see WeekdayRule.write_range."""
+    return _LAST_SUNDAY.write_range(start_year, end_year, out, as_ordinals)
+
+
+def _check_year_range(start_year, end_year):
+    if not isinstance(start_year, int) or not isinstance(end_year, int):
+        raise ValueError("The years must be integers.")
+    if start_year < _MIN_YEAR or end_year > _MAX_YEAR:
+        raise ValueError(f"Years must be between {_MIN_YEAR} and {_MAX_YEAR}.")
+
+
+def _row(year, month):
+    if not _MIN_YEAR <= year <= _MAX_YEAR:
+        raise ValueError(f"Years must be between {_MIN_YEAR} and {_MAX_YEAR}.")
+    if not 1 <= month <= 12:
+        raise ValueError("The month must be between 1 and 12.")
+    return year % _CYCLE_YEARS * 12 + month - 1
+
+
+def _is_leap_year(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def _days_before_year(year):
+    previous = year - 1
+    return previous * 365 + previous // 4 - previous // 100 + previous // 400
+
+
+@lru_cache(maxsize=None)
+def _cycle_table():
+    """Weekday of each month's 1st, its length and days before it; 12 entries per row indexed by year % 400."""
+    first_weekdays, lengths, days_before_month = bytearray(), bytearray(), array('H')
+    for year in range(_CYCLE_YEARS, 2 * _CYCLE_YEARS):
+        days_before = 0
+        for month, days in enumerate(_DAYS_IN_MONTH):
+            days += month == 1 and _is_leap_year(year)
+            # Ordinal 1 (0001-01-01) is a Monday, matching date.weekday().
+            first_weekdays.append((_days_before_year(year) + days_before) % 7)
+            lengths.append(days)
+            days_before_month.append(days_before)
+            days_before += days
+    return bytes(first_weekdays), bytes(lengths), days_before_month
+
+
+@lru_cache(maxsize=None)
+def _rule_table(weekday, occurrence):
+    """Day of month and 1-based day of year of the matching day, per row of the cycle table."""
+    first_weekdays, lengths, days_before_month = _cycle_table()
+    days_of_month = bytearray()
+    for first_weekday, length in zip(first_weekdays, lengths):
+        if occurrence > 0:
+            days_of_month.append(1 + (weekday - first_weekday) % 7 + (occurrence - 1) * 7)
         else:
-            next_month = datetime(year, month + 1, 1)
-        last_day_of_month = next_month - timedelta(days=1)
+            last_weekday = (first_weekday + length - 1) % 7
+            days_of_month.append(length - (last_weekday - weekday) % 7 + (occurrence + 1) * 7)
+    return bytes(days_of_month), array('H', map(int.__add__, days_before_month, days_of_month))
+
+
+@lru_cache(maxsize=None)
+def _rule_ordinals(weekday, occurrence):
+    """Ordinal of the matching day per row of the cycle table, taking row k as the year 400 + k."""
+    days_of_year = _rule_table(weekday, occurrence)[1]
+    return array('i', (_days_before_year(_CYCLE_YEARS + index // 12) + day for index, day in enumerate(days_of_year)))
+
+
+def _ordinal_blocks(weekday, occurrence, start_year, end_year):
+    """array('i') ordinals from start_year to end_year, one block per 400-year cycle touched.
 
-        days_to_subtract = (last_day_of_month.weekday() + 1) % 7
-        last_sunday_of_month = last_day_of_month - timedelta(days=days_to_subtract)
-        last_sundays.append(last_sunday_of_month.strftime('%Y-%m-%d'))
+    Year 400 * c + k is 400 + k moved on c - 1 cycles, so each block is a
+    slice of _rule_ordinals with one offset added to every entry.  The add is
+    done on the slice as one big integer of int32 lanes; every lane's result
+    is a positive ordinal that fits its lane, so no lane carries into the next.
+    """
+    ordinals = _rule_ordinals(weekday, occurrence)
+    year = start_year
+    while year <= end_year:
+        cycle, first_row = divmod(year, _CYCLE_YEARS)
+        stop_row = min(first_row + end_year - year + 1, _CYCLE_YEARS)
+        lanes = ordinals[first_row * 12:stop_row * 12]
+        ones = array(lanes.typecode, [1]) * len(lanes)
+        total = (int.from_bytes(lanes, sys.byteorder)
+                 + (cycle - 1) * _CYCLE_DAYS * int.from_bytes(ones, sys.byteorder))
+        block = array(lanes.typecode)
+        block.frombytes(total.to_bytes(len(lanes) * lanes.itemsize, sys.byteorder))
+        yield block
+        year += stop_row - first_row
 
-    return last_sundays
 
+@lru_cache(maxsize=None)
+def _rule_line_parts(weekday, occurrence):
+    """Per cycle row, b'' followed by the twelve b'-MM-DD\\n' tails that a year is joined between."""
+    days_of_month = _rule_table(weekday, occurrence)[0]
+    return [(b'',) + tuple(_MONTH_DAY_SUFFIXES[month][days_of_month[row + month]].encode('ascii') + b'\n'
+                           for month in range(12))
+            for row in range(0, _CYCLE_YEARS * 12, 12)]
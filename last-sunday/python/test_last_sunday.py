@@ -1,5 +1,9 @@
+import io
 import pytest
-from last_sunday import last_sunday
+from array import array
+from datetime import date, timedelta
+from last_sunday import (FRIDAY, LAST, SUNDAY, TUESDAY, WeekdayRule, last_sunday, last_sundays_range,
+                         write_last_sundays)
 
 @pytest.mark.parametrize("year, expected", [
     (2013, ['2013-01-27', '2013-02-24', '2013-03-31', '2013-04-28', '2013-05-26', 
@@ -19,3 +23,86 @@ def test_last_sunday(year, expected):
 def test_last_sunday_invalid_input():
     with pytest.raises(ValueError):
         last_sunday("not an integer")
+
+
+def test_last_sundays_range_matches_last_sunday_per_year():
+    expected = [day for year in range(1990, 2411) for day in last_sunday(year)]
+    assert last_sundays_range(1990, 2410) == expected
+
+
+def test_last_sundays_range_as_ordinals():
+    ordinals = last_sundays_range(2013, 2013, as_ordinals=True)
+    assert ordinals.typecode == 'i'
+    assert [date.fromordinal(ordinal).isoformat() for ordinal in ordinals] == last_sunday(2013)
+
+
+def test_last_sundays_range_empty_when_start_after_end():
+    assert last_sundays_range(2021, 2020) == []
+
+
+@pytest.mark.parametrize("start_year, end_year", [("2020", 2021), (0, 2020), (2020, 10000)])
+def test_last_sundays_range_invalid_input(start_year, end_year):
+    with pytest.raises(ValueError):
+        last_sundays_range(start_year, end_year)
+
+
+@pytest.mark.parametrize("weekday, occurrence, year, month, expected", [
+    (FRIDAY, LAST, 2024, 5, '2024-05-31'),
+    (TUESDAY, 2, 2024, 5, '2024-05-14'),
+    (SUNDAY, 1, 2023, 10, '2023-10-01'),
+    (SUNDAY, -2, 2032, 2, '2032-02-22'),
+])
+def test_weekday_rule_date(weekday, occurrence, year, month, expected):
+    assert WeekdayRule(weekday, occurrence).date(year, month) == expected
+
+
+@pytest.mark.parametrize("weekday", range(7))
+@pytest.mark.parametrize("occurrence", [1, 2, 3, 4, -1, -2, -3, -4])
+def test_weekday_rule_matches_datetime_over_a_century_boundary(weekday, occurrence):
+    rule = WeekdayRule(weekday, occurrence)
+    for ordinal, year in zip(rule.iter_range(1899, 1901, as_ordinals=True), [y for y in range(1899, 1902) for _ in range(12)]):
+        day = date.fromordinal(ordinal)
+        assert day.year == year and day.weekday() == weekday
+        if occurrence > 0:
+            assert (day.day - 1) // 7 == occurrence - 1
+        else:
+            assert (day + timedelta(days=7 * -occurrence)).month != day.month
+            assert (day + timedelta(days=7 * (-occurrence - 1))).month == day.month
+
+
+def test_weekday_rule_range_is_lazy():
+    dates = WeekdayRule(SUNDAY).iter_range(2013, 9999)
+    assert next(dates) == '2013-01-27'
+
+
+@pytest.mark.parametrize("weekday, occurrence", [(7, LAST), (SUNDAY, 0), (SUNDAY, 5)])
+def test_weekday_rule_invalid_input(weekday, occurrence):
+    with pytest.raises(ValueError):
+        WeekdayRule(weekday, occurrence)
+
+
+def test_write_last_sundays_appends_ascii_lines_to_buffer():
+    buffer = bytearray(b"date\n")
+    assert write_last_sundays(2013, 2020, buffer) == 96
+    assert buffer.decode('ascii').splitlines() == ["date"] + last_sundays_range(2013, 2020)
+
+
+def test_write_last_sundays_streams_to_file_in_chunks():
+    out = io.BytesIO()
+    write_last_sundays(1, 9999, out)
+    assert out.getvalue().decode('ascii').splitlines() == last_sundays_range(1, 9999)
+
+
+def test_write_range_as_ordinals():
+    rule = WeekdayRule(TUESDAY, 2)
+    out = io.BytesIO()
+    assert rule.write_range(2024, 2025, out, as_ordinals=True) == 24
+    assert array('i', out.getvalue()).tolist() == list(rule.iter_range(2024, 2025, as_ordinals=True))
+
+def test_write_range_ordinals_match_dates_across_cycles():
+    rule = WeekdayRule(FRIDAY, LAST)
+    ordinals, lines = bytearray(), bytearray()
+    rule.write_range(1, 9999, ordinals, as_ordinals=True)
+    rule.write_range(1, 9999, lines)
+    days = map(date.fromordinal, array('i', ordinals))
+    assert [f"{day.year}-{day.month:02d}-{day.day:02d}" for day in days] == lines.decode().split()
@@ -0,0 +1,46 @@
+"""Stepping many rovers: RoverFleet against a loop over MarsRover objects.
+
+Run with `python bench_mars_rover.py`.
+"""
+import random
+import time
+
+from mars_rover import MarsRover, RoverFleet
+
+ROVER_COUNT = 20_000
+TICKS = 50
+GRID_SIZE = (10_000, 10_000)
+
+
+def report(name, func, ticks):
+    started = time.perf_counter()
+    func(ticks)
+    elapsed = time.perf_counter() - started
+    print(f"{name:<28} {ROVER_COUNT * len(ticks) / elapsed / 1e6:8.2f} M rover-steps/s")
+
+
+def main():
+    rng = random.Random(42)
+    locations = [(rng.randrange(GRID_SIZE[0]), rng.randrange(GRID_SIZE[1])) for _ in range(ROVER_COUNT)]
+    directions = ''.join(rng.choice('NESW') for _ in range(ROVER_COUNT))
+    ticks = [''.join(rng.choices('fffblr', k=ROVER_COUNT)) for _ in range(TICKS)]
+
+    rovers = [MarsRover(list(location), direction, GRID_SIZE) for location, direction in zip(locations, directions)]
+    fleet = RoverFleet(locations, directions, GRID_SIZE)
+
+    def step_rovers(ticks):
+        for commands in ticks:
+            for rover, command in zip(rovers, commands):
+                rover.execute_commands(command)
+
+    def step_fleet(ticks):
+        for commands in ticks:
+            fleet.step(commands)
+
+    report("MarsRover loop", step_rovers, ticks)
+    report("RoverFleet.step", step_fleet, ticks)
+    assert fleet.locations() == [rover.current_location() for rover in rovers]
+
+
+if __name__ == '__main__':
+    main()
@@ -1,24 +1,201 @@
+import re
+import sys
+from array import array
+from collections import Counter, namedtuple
+from itertools import accumulate, compress
+
+HEADINGS = 'NESW'  # integer heading codes, clockwise, so a right turn adds 1
+_UNKNOWN_COMMAND = re.compile('[^fblr]')
+_TURNS_TO_SPACES = str.maketrans('lr', '  ')
+_DROP_MOVES = str.maketrans('', '', 'fb')
+_TURN_STEPS = bytes.maketrans(b'lr', b'\x03\x01')
+# Per relative heading k, 'f' and 'b' become the digits 2k and 2k + 1.
+_HEADING_MOVE_CODES = [str.maketrans('fb', f'{2 * k}{2 * k + 1}') for k in range(4)]
+_VALID_COMMANDS = b'fblr'
+_COMMAND_CODES = bytes.maketrans(_VALID_COMMANDS, bytes(range(4)))
+_CHECKPOINT_EVERY = 1024  # trajectory steps between stored absolute positions
+# A trajectory step (dx, dy), each -1, 0 or 1, is stored as the byte (dx + 1) * 3 + dy + 1.
+_STEP_X = tuple(code // 3 - 1 for code in range(9))
+_STEP_Y = tuple(code % 3 - 1 for code in range(9))
+_STEP_X_PLUS_1 = bytes(code // 3 for code in range(9)) + bytes(247)
+_STEP_Y_PLUS_1 = bytes(code % 3 for code in range(9)) + bytes(247)
+
+
+class CompiledCommands(namedtuple('CompiledCommands', 'moves turns')):
+    """A command string folded to net moves per relative heading and a net right-turn count.
+
+    `moves[k]` is the forward distance (negative for backward) travelled while
+    facing k quarter turns right of the starting heading, so the result
+    applies to any rover in O(1) whatever the length of the original string.
+    """
+
+
+def compile_commands(commands):
+    """Fold a string of 'f', 'b', 'l' and 'r' commands into CompiledCommands.
+
+    The moves between turns are relabelled with the heading they are made
+    in, then counted per heading with str.count.  The headings are running
+    sums of the turns, so no command is visited by a Python-level loop.
+    """
+    unknown = _UNKNOWN_COMMAND.search(commands)
+    if unknown:
+        raise ValueError(f"Unknown command {unknown.group()}")
+    segments = commands.translate(_TURNS_TO_SPACES).split(' ')
+    turns = commands.translate(_DROP_MOVES).encode('ascii').translate(_TURN_STEPS)
+    headings = bytes(map((3).__and__, accumulate(turns, initial=0)))
+    coded = ''.join(map(str.translate, segments, map(_HEADING_MOVE_CODES.__getitem__, headings)))
+    moves = tuple(coded.count(str(2 * k)) - coded.count(str(2 * k + 1)) for k in range(4))
+    return CompiledCommands(moves, headings[-1])
+
+
+class ObstacleGrid:
+    """Blocked cells of a grid, kept as a set of y * width + x keys so checks are O(1) at any grid size."""
+
+    def __init__(self, grid_size, obstacles=()):
+        self.grid_width, self.grid_height = grid_size
+        self._cells = set()
+        for x, y in obstacles:
+            self.add(x, y)
+
+    def __len__(self):
+        return len(self._cells)
+
+    def __contains__(self, cell):
+        return self._key(*cell) in self._cells
+
+    def __iter__(self):
+        for key in sorted(self._cells):
+            yield key % self.grid_width, key // self.grid_width
+
+    def add(self, x, y):
+        self._cells.add(self._key(x, y))
+
+    def discard(self, x, y):
+        self._cells.discard(self._key(x, y))
+
+    def is_blocked(self, x, y):
+        """Whether the cell at x, y (already within the grid) is blocked."""
+        return y * self.grid_width + x in self._cells
+
+    def _key(self, x, y):
+        return y % self.grid_height * self.grid_width + x % self.grid_width
+
+
+class Trajectory:
+    """Every position a rover passed through, one byte per command.
+
+    Positions are stored as steps of -1, 0 or 1 on each axis, with the
+    absolute position every `checkpoint_every` steps, so trajectory[k] costs
+    O(checkpoint_every) and iteration replays the path without building a
+    list.  Pass one to MarsRover.execute_commands to record into it; later
+    calls continue the same path.
+    """
+
+    def __init__(self, checkpoint_every=_CHECKPOINT_EVERY):
+        if checkpoint_every < 1:
+            raise ValueError("Checkpoints must be at least one step apart")
+        self.checkpoint_every = checkpoint_every
+        self.grid_width = self.grid_height = None
+        self._steps = bytearray()
+        self._checkpoints = array('q')
+        self._x = self._y = None
+
+    def __len__(self):
+        """Number of positions recorded, including the starting one."""
+        return len(self._steps) + 1 if self._checkpoints else 0
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Trajectory index out of range")
+        checkpoint = index // self.checkpoint_every
+        steps = self._steps[checkpoint * self.checkpoint_every:index]
+        x = self._checkpoints[2 * checkpoint] + sum(steps.translate(_STEP_X_PLUS_1)) - len(steps)
+        y = self._checkpoints[2 * checkpoint + 1] + sum(steps.translate(_STEP_Y_PLUS_1)) - len(steps)
+        return x % self.grid_width, y % self.grid_height
+
+    def __iter__(self):
+        if not self._checkpoints:
+            return
+        x, y = self._checkpoints[0], self._checkpoints[1]
+        yield x, y
+        for code in self._steps:
+            x = (x + _STEP_X[code]) % self.grid_width
+            y = (y + _STEP_Y[code]) % self.grid_height
+            yield x, y
+
+    @property
+    def nbytes(self):
+        return len(self._steps) + self._checkpoints.itemsize * len(self._checkpoints)
+
+    def append(self, x, y):
+        """Record the next position, one cell (or none) away from the last one."""
+        dx = (x - self._x) % self.grid_width
+        dy = (y - self._y) % self.grid_height
+        dx = dx if dx <= 1 else dx - self.grid_width
+        dy = dy if dy <= 1 else dy - self.grid_height
+        if not (-1 <= dx <= 1 and -1 <= dy <= 1):
+            raise ValueError("Trajectory positions must be adjacent")
+        self._steps.append((dx + 1) * 3 + dy + 1)
+        self._x, self._y = x, y
+        if len(self._steps) % self.checkpoint_every == 0:
+            self._checkpoints.extend((x, y))
+
+    def _start(self, rover):
+        location = rover.current_location()
+        if not self._checkpoints:
+            self.grid_width, self.grid_height = rover.grid_width, rover.grid_height
+            self._checkpoints.extend(location)
+            self._x, self._y = location
+        elif location != (self._x, self._y) or (rover.grid_width, rover.grid_height) != (
+                self.grid_width, self.grid_height):
+            raise ValueError("The rover is not where the trajectory ends")
+        return self.append
+
+
+def _obstacle_grid(obstacles, grid_size):
+    if obstacles is None:
+        return None
+    if not isinstance(obstacles, ObstacleGrid):
+        return ObstacleGrid(grid_size, obstacles)
+    if (obstacles.grid_width, obstacles.grid_height) != tuple(grid_size):
+        raise ValueError("The obstacle grid must have the same size as the rover's grid")
+    return obstacles
+
+
 class MarsRover:
     DIRECTIONS = {'N': (0, -1), 'S': (0, 1), 'E': (-1, 0), 'W': (1, 0)}
     LEFT_ROTATION = {'N': 'W', 'W': 'S', 'S': 'E', 'E': 'N'}
     RIGHT_ROTATION = {v: k for k, v in LEFT_ROTATION.items()}
+    HEADING_STEPS = tuple(map(DIRECTIONS.get, HEADINGS))
 
-    def __init__(self, location, direction, grid_size):
+    def __init__(self, location, direction, grid_size, obstacles=None):
+        """`obstacles` is an ObstacleGrid, which may be shared between rovers, or an iterable of (x, y) cells."""
         if direction not in self.DIRECTIONS:
             raise ValueError(f"Invalid direction: {direction}")
         self.x, self.y = location
         self.direction = direction
         self.grid_width, self.grid_height = grid_size
+        self.obstacles = _obstacle_grid(obstacles, grid_size)
 
     def move_forward(self):
+        """Move one cell forward; if an obstacle is there, stay put and return its cell."""
         dx, dy = self.DIRECTIONS[self.direction]
-        self.x = (self.x + dx) % self.grid_width
-        self.y = (self.y + dy) % self.grid_height
+        x = (self.x + dx) % self.grid_width
+        y = (self.y + dy) % self.grid_height
+        if self.obstacles is not None and self.obstacles.is_blocked(x, y):
+            return (x, y)
+        self.x, self.y = x, y
 
     def move_backward(self):
+        """Move one cell backward; if an obstacle is there, stay put and return its cell."""
         dx, dy = self.DIRECTIONS[self.direction]
-        self.x = (self.x - dx) % self.grid_width
-        self.y = (self.y - dy) % self.grid_height
+        x = (self.x - dx) % self.grid_width
+        y = (self.y - dy) % self.grid_height
+        if self.obstacles is not None and self.obstacles.is_blocked(x, y):
+            return (x, y)
+        self.x, self.y = x, y
 
     def turn_left(self):
         self.direction = self.LEFT_ROTATION[self.direction]
@@ -26,7 +203,21 @@ class MarsRover:
     def turn_right(self):
         self.direction = self.RIGHT_ROTATION[self.direction]
 
-    def execute_commands(self, commands):
+    def execute_commands(self, commands, compiled=False, trajectory=None):
+        """Run commands one by one, or with `compiled` fold them into one displacement first.
+
+        Either way, an unknown command raises ValueError after every command
+        before it has been applied.  With obstacles, commands always run one
+        by one and stop at the first blocked move, returning the blocking cell;
+        otherwise None is returned.  A Trajectory passed as `trajectory`
+        records the position after every command, which also runs them one
+        by one.
+        """
+        if self.obstacles is not None or trajectory is not None:
+            return self._execute_stepwise(commands, trajectory)
+        if compiled:
+            self._execute_compiled_prefix(commands)
+            return
         for command in commands:
             if command == 'f':
                 self.move_forward()
@@ -38,10 +229,248 @@ class MarsRover:
                 self.turn_right()
             else:
                 raise ValueError(f"Unknown command {command}")
-        
+
+    def _execute_stepwise(self, commands, trajectory):
+        record = None if trajectory is None else trajectory._start(self)
+        for command in commands:
+            if command == 'f':
+                blocked = self.move_forward()
+            elif command == 'b':
+                blocked = self.move_backward()
+            elif command == 'l':
+                blocked = self.turn_left()
+            elif command == 'r':
+                blocked = self.turn_right()
+            else:
+                raise ValueError(f"Unknown command {command}")
+            if blocked is not None:
+                return blocked
+            if record is not None:
+                record(self.x, self.y)
+        return None
+
+    def execute_compiled(self, program):
+        """Apply CompiledCommands: displacement arithmetic modulo the grid size."""
+        heading = HEADINGS.index(self.direction)
+        dx = dy = 0
+        for offset, distance in enumerate(program.moves):
+            step_x, step_y = self.HEADING_STEPS[(heading + offset) % 4]
+            dx += distance * step_x
+            dy += distance * step_y
+        self.x = (self.x + dx) % self.grid_width
+        self.y = (self.y + dy) % self.grid_height
+        self.direction = HEADINGS[(heading + program.turns) % 4]
+
+    def _execute_compiled_prefix(self, commands):
+        if not isinstance(commands, str):
+            commands = ''.join(commands)
+        unknown = _UNKNOWN_COMMAND.search(commands)
+        if unknown:
+            self.execute_compiled(compile_commands(commands[:unknown.start()]))
+            raise ValueError(f"Unknown command {unknown.group()}")
+        self.execute_compiled(compile_commands(commands))
 
     def current_location(self):
         return (self.x, self.y)
 
     def current_direction(self):
         return self.direction
+
+
+class RoverView(MarsRover):
+    """One rover of a RoverFleet, usable anywhere a MarsRover is; reads and writes go to the fleet's arrays."""
+
+    def __init__(self, fleet, index):
+        self._fleet = fleet
+        self._index = index
+
+    @property
+    def x(self):
+        return (self._fleet._xs[self._index] - self._fleet._ticks) % self._fleet.grid_width
+
+    @x.setter
+    def x(self, value):
+        self._fleet._xs[self._index] = value % self._fleet.grid_width + self._fleet._ticks
+
+    @property
+    def y(self):
+        return (self._fleet._ys[self._index] - self._fleet._ticks) % self._fleet.grid_height
+
+    @y.setter
+    def y(self, value):
+        self._fleet._ys[self._index] = value % self._fleet.grid_height + self._fleet._ticks
+
+    @property
+    def direction(self):
+        return HEADINGS[self._fleet._headings[self._index] >> 2]
+
+    @direction.setter
+    def direction(self, value):
+        self._fleet._headings[self._index] = HEADINGS.index(value) << 2
+
+    @property
+    def grid_width(self):
+        return self._fleet.grid_width
+
+    @property
+    def grid_height(self):
+        return self._fleet.grid_height
+
+    @property
+    def obstacles(self):
+        return self._fleet.obstacles
+
+
+def _fleet_tables():
+    # Indexed by heading * 4 + command code: the x and y steps plus 1, and the next heading * 4.
+    x_steps, y_steps, next_headings = bytearray(256), bytearray(256), bytearray(256)
+    for heading, (dx, dy) in enumerate(MarsRover.HEADING_STEPS):
+        for code, (sign, turn) in enumerate(((1, 0), (-1, 0), (0, -1), (0, 1))):
+            x_steps[heading * 4 + code] = sign * dx + 1
+            y_steps[heading * 4 + code] = sign * dy + 1
+            next_headings[heading * 4 + code] = (heading + turn) % 4 * 4
+    return bytes(x_steps), bytes(y_steps), bytes(next_headings)
+
+
+_FLEET_X_STEPS, _FLEET_Y_STEPS, _FLEET_NEXT_HEADINGS = _fleet_tables()
+_FLEET_DIRECTIONS = bytes.maketrans(bytes(range(0, 16, 4)), HEADINGS.encode('ascii'))
+
+
+class RoverFleet:
+    """Many rovers on one grid, stored as arrays of positions and integer heading codes.
+
+    step() moves every rover by one command without a Python-level loop per
+    rover: heading codes and command codes are added as one big integer of
+    byte lanes, translated to steps, and the steps added to the coordinate
+    arrays as one big integer of 64-bit lanes.  Each step adds 0, 1 or 2 to
+    the stored coordinates and counts one tick, so the true position is
+    (stored - ticks) modulo the grid, wrapped only when read.
+    """
+
+    def __init__(self, locations, directions, grid_size, obstacles=None):
+        """`obstacles` is an ObstacleGrid, which may be shared with rovers, or an iterable of (x, y) cells."""
+        locations = list(locations)
+        directions = ''.join(directions)
+        if len(locations) != len(directions):
+            raise ValueError("Each rover needs one location and one direction")
+        for direction in directions:
+            if direction not in MarsRover.DIRECTIONS:
+                raise ValueError(f"Invalid direction: {direction}")
+        self.grid_width, self.grid_height = grid_size
+        self._ticks = 0
+        self._xs = array('q', [x % self.grid_width for x, _ in locations])
+        self._ys = array('q', [y % self.grid_height for _, y in locations])
+        self._headings = bytearray(HEADINGS.index(direction) << 2 for direction in directions)
+        self.obstacles = _obstacle_grid(obstacles, grid_size)
+
+    @classmethod
+    def from_rovers(cls, rovers):
+        """Build a fleet from MarsRover objects that share one grid size and the same obstacles, if any."""
+        rovers = list(rovers)
+        grid_sizes = {(rover.grid_width, rover.grid_height) for rover in rovers}
+        if len(grid_sizes) > 1:
+            raise ValueError("All rovers in a fleet must share one grid size")
+        grid_size = grid_sizes.pop() if grid_sizes else (1, 1)
+        # Rovers usually share one ObstacleGrid; separate grids are compared by their cells.
+        grids = list({id(rover.obstacles): rover.obstacles for rover in rovers}.values())
+        if len({None if grid is None else frozenset(grid._cells) for grid in grids}) > 1:
+            raise ValueError("All rovers in a fleet must share the same obstacles")
+        return cls([rover.current_location() for rover in rovers],
+                   [rover.current_direction() for rover in rovers], grid_size, grids[0] if grids else None)
+
+    def __len__(self):
+        return len(self._headings)
+
+    def __getitem__(self, index):
+        if not -len(self) <= index < len(self):
+            raise IndexError("Rover index out of range")
+        return RoverView(self, index % len(self))
+
+    def __iter__(self):
+        return map(self.__getitem__, range(len(self)))
+
+    def locations(self):
+        return list(zip(self._wrapped(self._xs, self.grid_width), self._wrapped(self._ys, self.grid_height)))
+
+    def directions(self):
+        return self._headings.translate(_FLEET_DIRECTIONS).decode('ascii')
+
+    def collisions(self):
+        """Map each cell holding more than one rover to the indices of those rovers, in O(n).
+
+        Cells are hashed as y * grid_width + x; the per-rover lists are only
+        built when some cell is shared.
+        """
+        keys = self._keys()
+        shared = {key for key, count in Counter(keys).items() if count > 1}
+        if not shared:
+            return {}
+        cells = {}
+        for index, key in enumerate(keys):
+            if key in shared:
+                cells.setdefault((key % self.grid_width, key // self.grid_width), []).append(index)
+        return cells
+
+    def step(self, commands):
+        """Apply commands[i] to rover i, or one command to every rover, wrapping around the grid.
+
+        An unknown command raises ValueError before any rover moves.  With
+        obstacles, a rover whose move would end on a blocked cell stays put,
+        and a dict mapping the index of each such rover to the blocked cell is
+        returned; it is empty when nothing was blocked.
+        """
+        if isinstance(commands, str):
+            unknown = _UNKNOWN_COMMAND.search(commands)
+            if unknown:
+                raise ValueError(f"Unknown command {unknown.group()}")
+            commands = commands.encode('ascii')
+        else:
+            unknown = bytes(commands).translate(None, _VALID_COMMANDS)
+            if unknown:
+                raise ValueError(f"Unknown command {chr(unknown[0])}")
+        if len(commands) == 1:
+            commands = bytes(commands) * len(self)
+        elif len(commands) != len(self):
+            raise ValueError("Commands must hold one command per rover")
+
+        # Heading codes are multiples of 4 up to 12 and command codes at most 3, so no lane carries.
+        codes = (int.from_bytes(self._headings, 'little')
+                 + int.from_bytes(commands.translate(_COMMAND_CODES), 'little')).to_bytes(len(self), 'little')
+        xs, ys = self._xs, self._ys
+        self._xs = self._advanced(xs, codes.translate(_FLEET_X_STEPS))
+        self._ys = self._advanced(ys, codes.translate(_FLEET_Y_STEPS))
+        self._headings = bytearray(codes.translate(_FLEET_NEXT_HEADINGS))
+        self._ticks += 1
+        if self.obstacles is None:
+            return {}
+        return self._hold_back_blocked(xs, ys, codes)
+
+    def _hold_back_blocked(self, xs, ys, codes):
+        # Every rover's cell key is looked up at once; only rovers found on an
+        # obstacle are visited, and of those only the ones that moved there.
+        keys = self._keys()
+        blocked = {}
+        for index in compress(range(len(keys)), map(self.obstacles._cells.__contains__, keys)):
+            if codes[index] & 3 < 2:  # command codes 0 and 1 are 'f' and 'b'
+                self._xs[index] = xs[index] + 1
+                self._ys[index] = ys[index] + 1
+                blocked[index] = (keys[index] % self.grid_width, keys[index] // self.grid_width)
+        return blocked
+
+    @staticmethod
+    def _advanced(positions, steps):
+        # Put each step byte in the low byte of a 64-bit lane; stored positions never go negative.
+        width = positions.itemsize
+        lanes = bytearray(len(steps) * width)
+        lanes[0 if sys.byteorder == 'little' else width - 1::width] = steps
+        total = int.from_bytes(positions, sys.byteorder) + int.from_bytes(lanes, sys.byteorder)
+        advanced = array(positions.typecode)
+        advanced.frombytes(total.to_bytes(len(lanes), sys.byteorder))
+        return advanced
+
+    def _keys(self):
+        return list(map(int.__add__, map(self.grid_width.__mul__, self._wrapped(self._ys, self.grid_height)),
+                        self._wrapped(self._xs, self.grid_width)))
+
+    def _wrapped(self, positions, size):
+        return map(size.__rmod__, map((-self._ticks).__add__, positions))
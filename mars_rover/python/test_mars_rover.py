@@ -1,5 +1,7 @@
+import random
+
 import pytest
-from mars_rover import MarsRover
+from mars_rover import MarsRover, ObstacleGrid, RoverFleet, Trajectory, compile_commands
 
 def test_move_forward():
     rover = MarsRover([0, 0], 'S', [100, 100])
@@ -59,3 +61,156 @@ def test_full_rotation():
     assert rover.current_direction() == 'N'  # Full rotation left
     rover.execute_commands('rrrr')
     assert rover.current_direction() == 'N'  # Full rotation right
+
+def test_compiled_matches_step_by_step():
+    commands = 'ffrblfl' + 'f' * 250 + 'rrrbbllllfrfb' * 40
+    stepped = MarsRover([3, 4], 'E', [100, 60])
+    stepped.execute_commands(commands)
+    compiled = MarsRover([3, 4], 'E', [100, 60])
+    compiled.execute_commands(commands, compiled=True)
+    assert compiled.current_location() == stepped.current_location()
+    assert compiled.current_direction() == stepped.current_direction()
+
+def test_compile_commands_folds_runs():
+    program = compile_commands('fffbrrrlfl')
+    assert program.moves == (2, 0, 1, 0)
+    assert program.turns == 1
+
+def test_compiled_invalid_command_applies_prefix():
+    rover = MarsRover([0, 0], 'S', [100, 100])
+    with pytest.raises(ValueError) as excinfo:
+        rover.execute_commands('ffrxf', compiled=True)
+
+    assert str(excinfo.value) == "Unknown command x"
+    assert rover.current_location() == (0, 2)
+    assert rover.current_direction() == 'W'
+
+def test_fleet_step_matches_individual_rovers():
+    locations = [(0, 0), (99, 99), (5, 7)]
+    directions = 'SEW'
+    rovers = [MarsRover(list(location), direction, [100, 100]) for location, direction in zip(locations, directions)]
+    fleet = RoverFleet(locations, directions, [100, 100])
+    for commands in ['fbr', 'f', 'lff', 'bbb', 'rlf']:
+        fleet.step(commands)
+        for rover, command in zip(rovers, commands * 3 if len(commands) == 1 else commands):
+            rover.execute_commands(command)
+    assert fleet.locations() == [rover.current_location() for rover in rovers]
+    assert fleet.directions() == ''.join(rover.current_direction() for rover in rovers)
+
+def test_fleet_view_behaves_like_a_rover():
+    fleet = RoverFleet([(0, 0), (99, 99)], 'NS', [100, 100])
+    rover = fleet[1]
+    rover.execute_commands('frf')
+    assert isinstance(rover, MarsRover)
+    assert rover.current_location() == (0, 0)
+    assert rover.current_direction() == 'W'
+    assert fleet.locations()[1] == (0, 0)
+
+def test_fleet_invalid_command_moves_no_rover():
+    fleet = RoverFleet([(0, 0), (1, 1)], 'NN', [100, 100])
+    with pytest.raises(ValueError) as excinfo:
+        fleet.step('fx')
+
+    assert str(excinfo.value) == "Unknown command x"
+    assert fleet.locations() == [(0, 0), (1, 1)]
+
+def test_obstacle_stops_rover_and_reports_cell():
+    rover = MarsRover([0, 0], 'S', [100, 100], obstacles=[(0, 3)])
+    blocked = rover.execute_commands('ffffrf')
+    assert blocked == (0, 3)
+    assert rover.current_location() == (0, 2)
+    assert rover.current_direction() == 'S'
+
+def test_move_methods_stop_at_obstacles():
+    rover = MarsRover([0, 0], 'S', [10, 10], obstacles=[(0, 1), (0, 8)])
+    assert rover.move_forward() == (0, 1)
+    assert rover.move_backward() is None
+    assert rover.move_backward() == (0, 8)
+    assert rover.current_location() == (0, 9)
+
+def test_fleet_view_move_methods_stop_at_obstacles():
+    fleet = RoverFleet([(0, 0), (5, 5)], 'SS', [10, 10], obstacles=[(0, 1)])
+    assert fleet[0].move_forward() == (0, 1)
+    assert fleet[1].move_forward() is None
+    assert fleet.locations() == [(0, 0), (5, 6)]
+
+def test_obstacle_blocks_backward_move_across_edge():
+    rover = MarsRover([0, 0], 'S', [100, 100], obstacles=[(0, 99)])
+    assert rover.execute_commands('b') == (0, 99)
+    assert rover.current_location() == (0, 0)
+
+def test_no_obstacle_in_the_way_completes_commands():
+    rover = MarsRover([0, 0], 'S', [100, 100], obstacles=[(5, 5)])
+    assert rover.execute_commands('ffrff', compiled=True) is None
+    assert rover.current_location() == (2, 2)
+
+def test_obstacle_grid_handles_large_sparse_grids():
+    obstacles = ObstacleGrid([10000, 10000], [(9999, 9999), (0, 5000)])
+    rover = MarsRover([0, 0], 'N', [10000, 10000], obstacles=obstacles)
+    assert rover.execute_commands('b' * 4999 + 'bb') == (0, 5000)
+    assert rover.current_location() == (0, 4999)
+    assert (9999, -1) in obstacles
+    assert len(obstacles) == 2
+
+def test_fleet_from_rovers_keeps_their_obstacles():
+    obstacles = ObstacleGrid([10, 10], [(0, 1)])
+    rovers = [MarsRover([0, 0], 'S', [10, 10], obstacles=obstacles),
+              MarsRover([5, 5], 'S', [10, 10], obstacles=[(0, 1)])]
+    fleet = RoverFleet.from_rovers(rovers)
+    assert fleet.obstacles is obstacles
+    assert fleet.step('f') == {0: (0, 1)}
+    with pytest.raises(ValueError):
+        RoverFleet.from_rovers([rovers[0], MarsRover([5, 5], 'S', [10, 10])])
+
+def test_fleet_collisions_groups_rovers_sharing_a_cell():
+    fleet = RoverFleet([(0, 0), (1, 1), (2, 2), (0, 1)], 'WNNN', [100, 100])
+    assert fleet.collisions() == {}
+    fleet.step('f')
+    assert fleet.collisions() == {(1, 0): [0, 1]}
+
+def test_fleet_step_holds_back_rovers_facing_obstacles():
+    fleet = RoverFleet([(0, 0), (5, 5), (1, 0), (3, 3)], 'SSNN', [100, 100], obstacles=[(0, 1), (1, 1), (3, 2)])
+    assert fleet.step('ffbr') == {0: (0, 1), 2: (1, 1)}
+    assert fleet.locations() == [(0, 0), (5, 6), (1, 0), (3, 3)]
+    assert fleet.directions() == 'SSNE'
+    assert fleet.step('rfff') == {}
+
+def test_fleet_step_with_obstacles_matches_individual_rovers():
+    rng = random.Random(7)
+    obstacles = ObstacleGrid([12, 9], [(rng.randrange(12), rng.randrange(9)) for _ in range(30)])
+    free = [(x, y) for x in range(12) for y in range(9) if (x, y) not in obstacles]
+    locations = rng.sample(free, 20)
+    directions = ''.join(rng.choice('NESW') for _ in locations)
+    fleet = RoverFleet(locations, directions, [12, 9], obstacles=obstacles)
+    rovers = [MarsRover(list(location), direction, [12, 9], obstacles=obstacles)
+              for location, direction in zip(locations, directions)]
+    for _ in range(50):
+        commands = ''.join(rng.choices('fblr', k=len(rovers)))
+        expected = {index: cell for index, (rover, command) in enumerate(zip(rovers, commands))
+                    if (cell := rover.execute_commands(command)) is not None}
+        assert fleet.step(commands) == expected
+    assert fleet.locations() == [rover.current_location() for rover in rovers]
+    assert fleet.directions() == ''.join(rover.current_direction() for rover in rovers)
+
+def test_trajectory_records_every_position():
+    rover = MarsRover([0, 0], 'S', [100, 100])
+    trajectory = Trajectory(checkpoint_every=2)
+    rover.execute_commands('fflb', trajectory=trajectory)
+    assert list(trajectory) == [(0, 0), (0, 1), (0, 2), (0, 2), (1, 2)]
+    assert trajectory[3] == (0, 2)
+    assert trajectory[-1] == rover.current_location()
+
+def test_trajectory_wraps_and_continues_across_calls():
+    rover = MarsRover([0, 0], 'N', [5, 5])
+    trajectory = Trajectory(checkpoint_every=3)
+    rover.execute_commands('ff', trajectory=trajectory)
+    rover.execute_commands('rff', trajectory=trajectory)
+    assert list(trajectory) == [(0, 0), (0, 4), (0, 3), (0, 3), (4, 3), (3, 3)]
+    assert [trajectory[index] for index in range(len(trajectory))] == list(trajectory)
+    assert trajectory.nbytes < 6 * 16
+
+def test_trajectory_stops_at_obstacle():
+    rover = MarsRover([0, 0], 'S', [100, 100], obstacles=[(0, 2)])
+    trajectory = Trajectory()
+    assert rover.execute_commands('fff', trajectory=trajectory) == (0, 2)
+    assert list(trajectory) == [(0, 0), (0, 1)]
@@ -0,0 +1,32 @@
+"""Rendering throughput of number_to_words.
+
+Run with `python bench_number_to_words.py`.
+"""
+import random
+import time
+
+from number_to_words import number_to_words, numbers_to_words_many
+
+VALUE_COUNT = 200_000
+
+
+def report(name, func, values):
+    started = time.perf_counter()
+    func(values)
+    elapsed = time.perf_counter() - started
+    print(f"{name:<36} {len(values) / elapsed / 1e3:8.1f} k values/s")
+
+
+def main():
+    rng = random.Random(42)
+    small = [rng.randrange(10000) for _ in range(VALUE_COUNT)]
+    unsigned = [rng.getrandbits(64) for _ in range(VALUE_COUNT)]
+    signed = [rng.randrange(-2 ** 63, 2 ** 63) for _ in range(VALUE_COUNT)]
+    report("0-9999, per call", lambda values: [number_to_words(value) for value in values], small)
+    report("0-9999, numbers_to_words_many", numbers_to_words_many, small)
+    report("random uint64, per call", lambda values: [number_to_words(value) for value in values], unsigned)
+    report("random int64, numbers_to_words_many", numbers_to_words_many, signed)
+
+
+if __name__ == '__main__':
+    main()
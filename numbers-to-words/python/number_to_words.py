@@ -1,23 +1,183 @@
-def number_to_words(number):
-    if not 0 <= number <= 9999:
-        raise ValueError("Number out of range (0-9999)")
-
-    units = ["zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
-    teens = ["ten", "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen", "nineteen"]
-    tens = ["", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
-
-    def two_digit_number_to_words(n):
-        if n < 10:
-            return units[n]
-        elif 10 <= n < 20:
-            return teens[n-10]
+import sys
+import time
+from array import array
+from collections import deque, namedtuple
+from functools import lru_cache
+from itertools import islice
+
+_UNITS = ["zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+_TEENS = ["ten", "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen", "nineteen"]
+_TENS = ["", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
+_SCALES = ["", " thousand", " million", " billion", " trillion", " quadrillion", " quintillion", " sextillion",
+           " septillion", " octillion", " nonillion", " decillion", " undecillion", " duodecillion",
+           " tredecillion", " quattuordecillion", " quindecillion", " sexdecillion", " septendecillion",
+           " octodecillion", " novemdecillion", " vigintillion"]
+_MAX_NUMBER = 1000 ** len(_SCALES) - 1
+_TABLE_SIZE = 10000
+_STREAM_BATCH = 10000  # values rendered and written per batch
+
+
+class WordsTable:
+    """Renderings of every number from 0 to 9999, built once.
+
+    By default each rendering is its own string.  With `compact` they are
+    concatenated into one string indexed by an array of offsets, which holds
+    the same text in a fraction of the memory at the cost of a slice per lookup.
+    """
+
+    def __init__(self, compact=False):
+        words = _render_all()
+        self.compact = compact
+        if compact:
+            self._text = ''.join(words)
+            self._offsets = array('I', [0])
+            for rendering in words:
+                self._offsets.append(self._offsets[-1] + len(rendering))
+            self._words = None
         else:
-            return tens[n//10] + ("-" + units[n%10] if n%10 != 0 else "")
+            self._words = words
+
+    def __len__(self):
+        return _TABLE_SIZE
+
+    def __getitem__(self, number):
+        if self._words is not None:
+            return self._words[number]
+        return self._text[self._offsets[number]:self._offsets[number + 1]]
+
+    @property
+    def nbytes(self):
+        """Measured memory footprint of the table's containers and strings."""
+        if self._words is not None:
+            return sys.getsizeof(self._words) + sum(map(sys.getsizeof, self._words))
+        return sys.getsizeof(self._text) + sys.getsizeof(self._offsets)
+
+
+def number_to_words(number):
+    """Spell out an integer, using "minus" for negatives and short-scale words up to vigintillions.
+
+    0 to 9999 come straight from the table; larger numbers are rendered
+    one 3-digit group at a time from the same table.
+    """
+    if 0 <= number <= 9999:
+        return _words_table(False)[number]
+    if not isinstance(number, int):
+        raise TypeError("Number must be an integer")
+
+    words = _words_table(False)
+    sign = ""
+    if number < 0:
+        sign, number = "minus ", -number
+        if number <= 9999:
+            return sign + words[number]
+    if number > _MAX_NUMBER:
+        raise ValueError(f"Number out of range (up to {len(_SCALES) * 3} digits)")
+
+    digits = str(number)
+    first = len(digits) % 3 or 3
+    groups = map(int, [digits[:first]] + [digits[start:start + 3] for start in range(first, len(digits), 3)])
+    scales = reversed(_SCALES[:(len(digits) + 2) // 3])
+    return sign + " ".join([words[group] + scale for group, scale in zip(groups, scales) if group])
+
+
+def numbers_to_words_many(numbers, compact=False):
+    """Render every number in `numbers`, with one table lookup each when all are within 0-9999."""
+    numbers = list(numbers)
+    if numbers and not (0 <= min(numbers) and max(numbers) <= 9999):
+        return list(map(number_to_words, numbers))
+    return list(map(_words_table(compact).__getitem__, numbers))
 
-    if number < 100:
-        return two_digit_number_to_words(number)
-    elif number < 1000:
-        return units[number // 100] + " hundred" + (" " + two_digit_number_to_words(number % 100) if number % 100 != 0 else "")
+
+class ConversionStats(namedtuple('ConversionStats', 'rows seconds')):
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else float('inf')
+
+
+def write_numbers_as_words(numbers, out, workers=None, batch_size=_STREAM_BATCH):
+    """Write number_to_words of every value in `numbers` to the text stream `out`, one per line.
+
+    `numbers` may hold ints or numeric strings such as the lines of a file;
+    blank strings are skipped.
+    Values are rendered in batches, so memory stays bounded however long the
+    input is.  With `workers` set, batches are rendered in a process pool
+    while at most two per worker are in flight.  Returns ConversionStats.
+    """
+    started = time.perf_counter()
+    # Blank lines, such as the trailing one of many column exports, are skipped.
+    numbers = (value for value in numbers if isinstance(value, int) or value.strip())
+    batches = iter(lambda: list(islice(numbers, batch_size)), [])
+    rows = 0
+    if workers is None:
+        for batch in batches:
+            out.write(_render_batch(batch))
+            rows += len(batch)
     else:
-        return two_digit_number_to_words(number // 1000) + " thousand" + (" " + number_to_words(number % 1000) if number % 1000 != 0 else "")
+        # Imported here so plain number_to_words callers do not load multiprocessing.
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(workers) as executor:
+            pending = deque()
+            for batch in batches:
+                pending.append((executor.submit(_render_batch, batch), len(batch)))
+                if len(pending) >= 2 * workers:
+                    future, count = pending.popleft()
+                    out.write(future.result())
+                    rows += count
+            for future, count in pending:
+                out.write(future.result())
+                rows += count
+    return ConversionStats(rows, time.perf_counter() - started)
+
+
+def _render_batch(values):
+    numbers = [value if isinstance(value, int) else int(value) for value in values]
+    return "\n".join(numbers_to_words_many(numbers)) + "\n"
+
+
+@lru_cache(maxsize=None)
+def _words_table(compact):
+    return WordsTable(compact)
+
+
+def _render_all():
+    # Numbers are rendered in order, so the remainder after the hundreds or
+    # thousands is always already in the list.
+    words = []
+    for number in range(_TABLE_SIZE):
+        if number < 10:
+            words.append(_UNITS[number])
+        elif number < 20:
+            words.append(_TEENS[number - 10])
+        elif number < 100:
+            words.append(_TENS[number // 10] + ("-" + _UNITS[number % 10] if number % 10 != 0 else ""))
+        elif number < 1000:
+            words.append(_UNITS[number // 100] + " hundred" + (" " + words[number % 100] if number % 100 != 0 else ""))
+        else:
+            words.append(words[number // 1000] + " thousand" + (" " + words[number % 1000] if number % 1000 != 0 else ""))
+    return words
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Spell out one integer per line.")
+    parser.add_argument('input', nargs='?', default='-', help="file of integers (default: stdin)")
+    parser.add_argument('output', nargs='?', default='-', help="file to write words to (default: stdout)")
+    parser.add_argument('--workers', type=int, default=None, help="render in this many processes")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == '-' else open(args.input)
+    target = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        stats = write_numbers_as_words(source, target, args.workers)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    print(f"{stats.rows} rows in {stats.seconds:.2f}s ({stats.rows_per_second:,.0f} rows/s)", file=sys.stderr)
+
 
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,6 @@
 import pytest
-from number_to_words import number_to_words
+import io
+from number_to_words import WordsTable, main, number_to_words, numbers_to_words_many, write_numbers_as_words
 
 def test_single_digits():
     assert number_to_words(0) == "zero"
@@ -45,8 +46,80 @@ def test_extreme_cases():
 
 def test_invalid_input():
     with pytest.raises(ValueError):
-        number_to_words(-1)
+        number_to_words(10 ** 66)
     with pytest.raises(ValueError):
-        number_to_words(10000)
+        number_to_words(-10 ** 66)
     with pytest.raises(TypeError):
         number_to_words("one thousand")
+    with pytest.raises(TypeError):
+        number_to_words(12345.0)
+
+def test_negative_numbers():
+    assert number_to_words(-1) == "minus one"
+    assert number_to_words(-9999) == "minus nine thousand nine hundred ninety-nine"
+    assert number_to_words(-1000000) == "minus one million"
+
+def test_five_digits_and_more():
+    assert number_to_words(10000) == "ten thousand"
+    assert number_to_words(12345) == "twelve thousand three hundred forty-five"
+    assert number_to_words(100200300) == "one hundred million two hundred thousand three hundred"
+    assert number_to_words(1000001) == "one million one"
+    assert number_to_words(2 ** 64 - 1) == ("eighteen quintillion four hundred forty-six quadrillion "
+                                           "seven hundred forty-four trillion seventy-three billion "
+                                           "seven hundred nine million five hundred fifty-one thousand six hundred fifteen")
+    assert number_to_words(10 ** 36) == "one undecillion"
+    assert number_to_words(10 ** 66 - 1).startswith("nine hundred ninety-nine vigintillion")
+
+def test_numbers_to_words_many():
+    assert numbers_to_words_many([0, 21, 303, 3466]) == ["zero", "twenty-one", "three hundred three", "three thousand four hundred sixty-six"]
+    assert numbers_to_words_many([]) == []
+    assert numbers_to_words_many(range(10000), compact=True) == [number_to_words(n) for n in range(10000)]
+
+def test_numbers_to_words_many_outside_table_range():
+    assert numbers_to_words_many([1, -1, 10000]) == ["one", "minus one", "ten thousand"]
+
+def test_numbers_to_words_many_invalid_input():
+    with pytest.raises(ValueError):
+        numbers_to_words_many([1, 10 ** 66])
+    with pytest.raises(TypeError):
+        numbers_to_words_many(["one"])
+
+def test_compact_words_table_uses_less_memory():
+    table, compact = WordsTable(), WordsTable(compact=True)
+    assert compact[9999] == table[9999] == "nine thousand nine hundred ninety-nine"
+    assert compact.nbytes < table.nbytes / 2
+
+def test_write_numbers_as_words_streams_one_line_per_value():
+    values = [0, 21, -7, 10 ** 6, 9999]
+    out = io.StringIO()
+
+    stats = write_numbers_as_words(values, out, batch_size=2)
+
+    assert out.getvalue().splitlines() == [number_to_words(value) for value in values]
+    assert stats.rows == 5
+
+def test_write_numbers_as_words_skips_blank_lines():
+    out = io.StringIO()
+
+    stats = write_numbers_as_words(["12\n", "\n", "  \n", "7\n", ""], out, batch_size=2)
+
+    assert out.getvalue() == "twelve\nseven\n"
+    assert stats.rows == 2
+
+def test_write_numbers_as_words_in_process_pool_keeps_order():
+    values = list(range(-50, 5000, 7))
+    out = io.StringIO()
+
+    stats = write_numbers_as_words(values, out, workers=2, batch_size=64)
+
+    assert out.getvalue().splitlines() == [number_to_words(value) for value in values]
+    assert stats.rows == len(values)
+
+def test_command_line_reads_and_writes_files(tmp_path, capsys):
+    source, target = tmp_path / "amounts.txt", tmp_path / "words.txt"
+    source.write_text("12\n3466\n-1\n")
+
+    main([str(source), str(target)])
+
+    assert target.read_text() == "twelve\nthree thousand four hundred sixty-six\nminus one\n"
+    assert "3 rows" in capsys.readouterr().err
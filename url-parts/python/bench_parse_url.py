@@ -0,0 +1,105 @@
+"""Throughput of parse_url and parse_urls on access-log-like URLs.
+
+Hosts and paths are drawn from Zipf distributions, so a few popular pages
+dominate as they do in real logs.  Run with `python bench_parse_url.py`.
+"""
+import random
+import time
+
+from parse_url import parse_url, parse_urls
+
+URL_COUNT = 500_000
+DISTINCT_HOSTS = 2_000
+DISTINCT_PATHS = 20_000
+ZIPF_EXPONENT = 1.1
+CACHE_SIZE = 16_384
+
+
+def baseline_parse_url(url):
+    """parse_url as it was before it was rewritten as a single pass, verbatim, kept for comparison."""
+    if not url.startswith(('http://', 'https://', 'ftp://', 'sftp://')):
+        raise ValueError("Invalid URL")
+
+    # Splitting the protocol
+    protocol_split = url.split("://")
+    protocol = protocol_split[0]
+    rest = protocol_split[1]
+
+    # Default ports
+    default_ports = {'http': '80', 'https': '443', 'ftp': '21', 'sftp': '22'}
+
+    # Initial values
+    subdomain, domain, port, path = '', '', default_ports[protocol], ''
+
+    # Splitting the rest of the URL
+    if '/' in rest:
+        domain_and_port, path = rest.split('/', 1)
+        path = path.split('#')[0].split('?')[0]  # Removing fragment and query
+    else:
+        domain_and_port = rest
+
+    # Handling subdomain and port
+    if ':' in domain_and_port:
+        domain_and_port, port = domain_and_port.split(':')
+
+    # Splitting domain and subdomain
+    domain_parts = domain_and_port.split('.')
+    if len(domain_parts) == 1:
+        # Case for 'localhost' or similar
+        domain = domain_parts[0]
+    elif len(domain_parts) == 2:
+        # Regular domain with TLD
+        domain = '.'.join(domain_parts)
+    else:
+        # Domain with subdomain and TLD
+        domain = '.'.join(domain_parts[-2:])
+        subdomain = '.'.join(domain_parts[:-2])
+
+    return {
+        'protocol': protocol,
+        'subdomain': subdomain,
+        'domain': domain,
+        'port': port,
+        'path': path
+    }
+
+
+def zipf_choices(rng, population, count):
+    weights = [1 / rank ** ZIPF_EXPONENT for rank in range(1, len(population) + 1)]
+    return rng.choices(population, weights=weights, k=count)
+
+
+def sample_urls(count, seed=42):
+    rng = random.Random(seed)
+    words = ['api', 'static', 'img', 'shop', 'blog', 'news', 'cdn', 'login', 'user', 'search', 'v1', 'v2']
+    hosts = [f"{rng.choice(['', 'www.', 'm.', 'eu.west.'])}{rng.choice(words)}{index}.{rng.choice(['com', 'org', 'io'])}"
+             + rng.choice(['', '', '', ':8080'])
+             for index in range(DISTINCT_HOSTS)]
+    paths = ['/'.join(rng.choices(words, k=rng.randrange(1, 5))) + rng.choice(['', '.html', '.png', '.js'])
+             + rng.choice(['', '', f'?id={index}', f'?q={index}&page=2', '#top'])
+             for index in range(DISTINCT_PATHS)]
+    schemes = rng.choices(['https://', 'http://', 'ftp://', 'sftp://'], weights=[80, 17, 2, 1], k=count)
+    return [scheme + host + '/' + path
+            for scheme, host, path in zip(schemes, zipf_choices(rng, hosts, count), zipf_choices(rng, paths, count))]
+
+
+def report(name, func, urls, repeat=3):
+    elapsed = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(urls)
+        elapsed = min(elapsed, time.perf_counter() - started)
+    print(f"{name:<32} {len(urls) / elapsed / 1e6:8.2f} M URLs/s")
+
+
+def main():
+    urls = sample_urls(URL_COUNT)
+    assert list(map(baseline_parse_url, urls)) == list(parse_urls(urls))
+    report("baseline, per call", lambda urls: [baseline_parse_url(url) for url in urls], urls)
+    report("parse_url, per call", lambda urls: [parse_url(url) for url in urls], urls)
+    report("parse_urls", lambda urls: list(parse_urls(urls)), urls)
+    report(f"parse_urls, {CACHE_SIZE} cached", lambda urls: list(parse_urls(urls, CACHE_SIZE)), urls)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,47 +1,79 @@
-def parse_url(url):
-    if not url.startswith(('http://', 'https://', 'ftp://', 'sftp://')):
-        raise ValueError("Invalid URL")
+from functools import lru_cache
+
+# Default ports, built once rather than on every call
+_DEFAULT_PORTS = {'http': '80', 'https': '443', 'ftp': '21', 'sftp': '22'}
+
+
+def _url_parser(split_host):
+    """Build parse_url around `split_host`, which may be cached."""
 
-    # Splitting the protocol
-    protocol_split = url.split("://")
-    protocol = protocol_split[0]
-    rest = protocol_split[1]
+    def parse_url(url):
+        # Splitting the protocol; unknown protocols and a second '://' take the general path
+        protocol, separator, rest = url.partition('://')
+        default_port = _DEFAULT_PORTS.get(protocol)
+        if default_port is None or not separator or '://' in rest:
+            return _parse_general(url)
 
-    # Default ports
-    default_ports = {'http': '80', 'https': '443', 'ftp': '21', 'sftp': '22'}
+        # Splitting the rest of the URL
+        domain_and_port, _, path = rest.partition('/')
+        if '#' in path or '?' in path:
+            path = path.split('#', 1)[0].split('?', 1)[0]  # Removing fragment and query
+        subdomain, domain, port = split_host(domain_and_port)
 
-    # Initial values
-    subdomain, domain, port, path = '', '', default_ports[protocol], ''
+        return {
+            'protocol': protocol,
+            'subdomain': subdomain,
+            'domain': domain,
+            'port': default_port if port is None else port,
+            'path': path
+        }
 
-    # Splitting the rest of the URL
-    if '/' in rest:
-        domain_and_port, path = rest.split('/', 1)
-        path = path.split('#')[0].split('?')[0]  # Removing fragment and query
-    else:
-        domain_and_port = rest
+    return parse_url
 
-    # Handling subdomain and port
+
+def _split_host(domain_and_port):
+    """(subdomain, domain, port) of a host, with port None when the URL does not give one."""
+    port = None
     if ':' in domain_and_port:
         domain_and_port, port = domain_and_port.split(':')
 
     # Splitting domain and subdomain
-    domain_parts = domain_and_port.split('.')
-    if len(domain_parts) == 1:
-        # Case for 'localhost' or similar
-        domain = domain_parts[0]
-    elif len(domain_parts) == 2:
-        # Regular domain with TLD
-        domain = '.'.join(domain_parts)
-    else:
-        # Domain with subdomain and TLD
-        domain = '.'.join(domain_parts[-2:])
-        subdomain = '.'.join(domain_parts[:-2])
+    domain_parts = domain_and_port.rsplit('.', 2)
+    if len(domain_parts) < 3:
+        return '', domain_and_port, port
+    return domain_parts[0], domain_parts[1] + '.' + domain_parts[2], port
+
+
+parse_url = _url_parser(_split_host)
+
+
+def parse_urls(urls, cache_size=None):
+    """Lazily parse every URL in `urls`, raising ValueError at the first invalid one.
+
+    With `cache_size`, the split of the most recently seen hosts into
+    subdomain, domain and port is kept in an LRU cache of that many entries,
+    which pays off when the same hosts repeat as they do in access logs.
+    """
+    if cache_size is None:
+        return map(parse_url, urls)
+    if cache_size <= 0:
+        raise ValueError("Cache size must be positive")
+    return map(_url_parser(lru_cache(cache_size)(_split_host)), urls)
+
+
+def _parse_general(url):
+    if not url.startswith(('http://', 'https://', 'ftp://', 'sftp://')):
+        raise ValueError("Invalid URL")
+
+    # Only what comes before a second '://' is parsed
+    protocol, rest = url.split('://')[:2]
+    domain_and_port, _, path = rest.partition('/')
+    subdomain, domain, port = _split_host(domain_and_port)
 
     return {
         'protocol': protocol,
         'subdomain': subdomain,
         'domain': domain,
-        'port': port,
-        'path': path
+        'port': _DEFAULT_PORTS[protocol] if port is None else port,
+        'path': path.split('#')[0].split('?')[0]  # Removing fragment and query
     }
-
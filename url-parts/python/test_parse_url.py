@@ -1,5 +1,5 @@
 import pytest
-from parse_url import parse_url 
+from parse_url import parse_url, parse_urls
 
 def test_standard_http_url():
     url = "http://foo.bar.com/foobar.html"
@@ -49,3 +49,37 @@ def test_invalid_url():
     with pytest.raises(ValueError):
         parse_url("this_is_not_a_valid_url")
 
+def test_query_string_and_second_scheme_are_not_part_of_the_path():
+    url = "https://a.b.example.com/redirect?to=http://other.com/page"
+    expected = {
+        'protocol': 'https',
+        'subdomain': 'a.b',
+        'domain': 'example.com',
+        'port': '443',
+        'path': 'redirect'
+    }
+    assert parse_url(url) == expected
+
+def test_more_than_one_port_is_invalid():
+    with pytest.raises(ValueError):
+        parse_url("http://foo.com:80:81/index.html")
+
+def test_parse_urls_matches_parse_url():
+    urls = ["http://foo.bar.com/foobar.html", "sftp://files.example.org:2222", "https://localhost/index.html#footer"]
+    assert list(parse_urls(urls)) == [parse_url(url) for url in urls]
+
+def test_parse_urls_with_cache_returns_fresh_dicts():
+    urls = ["https://www.foobar.com:8080/a", "https://www.foobar.com:8080/b"]
+    first, second = parse_urls(urls, cache_size=16)
+    first['path'] = 'changed'
+    assert second == {
+        'protocol': 'https',
+        'subdomain': 'www',
+        'domain': 'foobar.com',
+        'port': '8080',
+        'path': 'b'
+    }
+
+def test_parse_urls_rejects_non_positive_cache_size():
+    with pytest.raises(ValueError):
+        parse_urls([], cache_size=0)